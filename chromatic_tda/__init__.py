@@ -1,5 +1,6 @@
 from .entities.chromatic_alpha_complex import ChromaticAlphaComplex
 from .entities.simplicial_complex import SimplicialComplex
+from .utils.metrics import Metrics
 from .plots.plotting_functions import plot_persistence_diagram, plot_six_pack, plot_labeled_point_set, plot_edges
 from .experimental.feature_extraction import BLANK
 import importlib.metadata
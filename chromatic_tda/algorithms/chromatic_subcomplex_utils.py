@@ -1,5 +1,8 @@
 import itertools
 
+import numpy as np
+import numpy.typing as npt
+
 from chromatic_tda.core.core_simplicial_complex import CoreSimplicialComplex
 from chromatic_tda.core.simplicial_complex_factory import CoreSimplicialComplexFactory
 
@@ -131,3 +134,19 @@ class ChromaticComplexUtils:
             simplex_split[lab].append(v)
 
         return simplex_split
+
+    @staticmethod
+    def split_simplices_by_labels(simplices: npt.NDArray, labeling: npt.NDArray,
+                                  labels_number: int) -> tuple[npt.NDArray, npt.NDArray]:
+        """Split all rows of the (m, k) array of simplices by the labels at once, as `split_simplex_by_labels`.
+        Return the (m, k) permutation sorting each row stably by the labels, and the (m, labels_number + 1) offsets,
+        such that the vertices of label `lab` of row i are at the positions offsets[i, lab]:offsets[i, lab + 1] of
+        the permuted row. The labels are internal, i.e., 0, ..., labels_number - 1."""
+        simplex_labels = labeling[simplices]
+        permutation = np.argsort(simplex_labels, axis=1, kind='stable')
+        rows = labels_number * np.arange(len(simplices))[:, np.newaxis]
+        counts = np.bincount((simplex_labels + rows).ravel(),
+                             minlength=len(simplices) * labels_number).reshape(len(simplices), labels_number)
+        offsets = np.zeros((len(simplices), labels_number + 1), dtype=int)
+        np.cumsum(counts, axis=1, out=offsets[:, 1:])
+        return permutation, offsets
@@ -1,19 +1,44 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable
+
+import numpy as np
+import numpy.typing as npt
+
 from chromatic_tda.algorithms.reduce_matrix import MatrixReduction
 from chromatic_tda.core.core_simplicial_complex import CoreSimplicialComplex
 from chromatic_tda.utils.filter_functions import FilterFunctions
+from chromatic_tda.utils.timing import TimingUtils
 
 
 class PersistenceAlgorithm:  # why is this not a singleton? with complex as a parameter for each function?
     complex: CoreSimplicialComplex
     filters: FilterFunctions
 
+    # The prerequisites graph of the reductions, {group : {prerequisite : data of the prerequisite read}}:
+    #   complex    -R--> image
+    #   complex    -R--> relative
+    #   complex    -V--> kernel
+    #   complex    -R--> co_kernel
+    #   sub_complex -V--> co_kernel
+    # where R is the reduced matrix and V the cycles.
+    REDUCTION_PREREQUISITES = {
+        'complex': {},
+        'sub_complex': {},
+        'image': {'complex': ('reduced_matrix',)},
+        'kernel': {'complex': ('cycles',)},
+        'cokernel': {'complex': ('reduced_matrix',), 'sub_complex': ('cycles',)},
+        'relative': {'complex': ('reduced_matrix',)},
+    }
+
     def __init__(self, simplicial_complex: CoreSimplicialComplex) -> None:
         if set(simplicial_complex.simplex_weights.keys()) != set(simplicial_complex.boundary.keys()):
             raise ValueError("The weight function does not match the simplices of the simplicial complex.")
         self.complex = simplicial_complex
-        self.filters = FilterFunctions(simplicial_complex.simplex_weights, simplicial_complex.sub_complex)
+        self.filters = FilterFunctions(simplicial_complex.simplex_weights, simplicial_complex.sub_complex,
+                                       total_filtration=simplicial_complex.get_total_filtration())
 
-    def compute_persistence(self) -> None:
+    def compute_persistence(self, n_jobs: int = 1) -> None:
         """
         Compute the following persistence homology:
             complex -- PH of the whole complex
@@ -21,8 +46,14 @@ class PersistenceAlgorithm:  # why is this not a singleton? with complex as a pa
             kernel -- kernel PH
             image  -- image PH
             cokernel -- co_kernel PH
+
+        If `n_jobs` > 1, the reductions are run concurrently in `n_jobs` processes.
         """
-        self._compute_persistence_data()
+        TimingUtils().start("Pers :: Compute Persistence")
+        if n_jobs > 1:
+            self._compute_persistence_data_concurrently(n_jobs=n_jobs)
+        else:
+            self._compute_persistence_data()
         self.complex.birth_death = {}
         self._compute_birth_death_complex()
         self._compute_birth_death_sub_complex()
@@ -30,13 +61,18 @@ class PersistenceAlgorithm:  # why is this not a singleton? with complex as a pa
         self._compute_birth_death_kernel()
         self._compute_birth_death_cokernel()
         self._compute_persistence_relative()
+        TimingUtils().stop("Pers :: Compute Persistence")
+
+    def _nonzero_columns(self, group: str) -> set:
+        """Return the nonzero columns of the reduced matrix of `group`, which are exactly the columns of its pivots."""
+        return set(self.complex.persistence_data[group]['pivots'].values())
 
     def _compute_birth_death_complex(self) -> None:
-        Rf = self.complex.persistence_data['complex']['reduced_matrix']
+        nonzero_f = self._nonzero_columns('complex')
         low_inv_f = self.complex.persistence_data['complex']['pivots']
 
-        birth = set(s for s in Rf if len(Rf[s]) == 0)
-        death = set(s for s in Rf if len(Rf[s]) != 0)
+        birth = set(s for s in self.complex.boundary if s not in nonzero_f)
+        death = nonzero_f
         pairs = set((k, v) for k, v in low_inv_f.items())
         killed = set(pair[0] for pair in pairs)
         essential = birth - killed
@@ -49,11 +85,11 @@ class PersistenceAlgorithm:  # why is this not a singleton? with complex as a pa
         }
 
     def _compute_birth_death_sub_complex(self) -> None:
-        Rg = self.complex.persistence_data['sub_complex']['reduced_matrix']
+        nonzero_g = self._nonzero_columns('sub_complex')
         low_inv_g = self.complex.persistence_data['sub_complex']['pivots']
 
-        birth = set(s for s in Rg if len(Rg[s]) == 0)
-        death = set(s for s in Rg if len(Rg[s]) != 0)
+        birth = set(s for s in self.complex.sub_complex if s not in nonzero_g)
+        death = nonzero_g
         pairs = set((k, v) for k, v in low_inv_g.items())
         killed = set(pair[0] for pair in pairs)
         essential = birth - killed
@@ -66,10 +102,10 @@ class PersistenceAlgorithm:  # why is this not a singleton? with complex as a pa
         }
 
     def _compute_birth_death_image(self) -> None:
-        Rg = self.complex.persistence_data['sub_complex']['reduced_matrix']
+        nonzero_g = self._nonzero_columns('sub_complex')
         low_inv_im = self.complex.persistence_data['image']['pivots']
 
-        birth = set(s for s in Rg if len(Rg[s]) == 0)
+        birth = set(s for s in self.complex.sub_complex if s not in nonzero_g)
         pairs = set((k, v) for k, v in low_inv_im.items() if k in self.complex.sub_complex)
         death = set(pair[1] for pair in pairs)
         killed = set(pair[0] for pair in pairs)
@@ -83,16 +119,16 @@ class PersistenceAlgorithm:  # why is this not a singleton? with complex as a pa
         }
 
     def _compute_birth_death_kernel(self) -> None:
-        Rf = self.complex.persistence_data['complex']['reduced_matrix']
-        Rg = self.complex.persistence_data['sub_complex']['reduced_matrix']
+        nonzero_f = self._nonzero_columns('complex')
+        nonzero_g = self._nonzero_columns('sub_complex')
         low_inv_im = self.complex.persistence_data['image']['pivots']
         low_inv_ker = self.complex.persistence_data['kernel']['pivots']
 
         birth = set(v for k, v in low_inv_im.items() if (v not in self.complex.sub_complex and
                                                          k in self.complex.sub_complex))
         pairs = set((k, v) for k, v in low_inv_ker.items() if (v in self.complex.sub_complex and  # tau in L
-                                                               len(Rg[v]) != 0 and  # tau negative in Rg
-                                                               len(Rf[v]) == 0))  # tau positive in Rf
+                                                               v in nonzero_g and  # tau negative in Rg
+                                                               v not in nonzero_f))  # tau positive in Rf
         death = set(pair[1] for pair in pairs)
         killed = set(pair[0] for pair in pairs)
         essential = birth - killed
@@ -105,14 +141,14 @@ class PersistenceAlgorithm:  # why is this not a singleton? with complex as a pa
         }
 
     def _compute_birth_death_cokernel(self) -> None:
-        Rim = self.complex.persistence_data['image']['reduced_matrix']
         low_im = {v: k for k, v in self.complex.persistence_data['image']['pivots'].items()}
-        Rg = self.complex.persistence_data['sub_complex']['reduced_matrix']
+        nonzero_g = self._nonzero_columns('sub_complex')
         low_inv_cok = self.complex.persistence_data['cokernel']['pivots']
 
-        birth = set(s for s in Rim if len(Rim[s]) == 0 and (s not in self.complex.sub_complex or len(Rg[s]) != 0))
+        birth = set(s for s in self.complex.boundary
+                    if s not in low_im and (s not in self.complex.sub_complex or s in nonzero_g))
         pairs = set((k, v) for k, v in low_inv_cok.items()
-                    if len(Rim[v]) != 0 and low_im[v] not in self.complex.sub_complex)
+                    if v in low_im and low_im[v] not in self.complex.sub_complex)
         death = set(pair[1] for pair in pairs)
         killed = set(pair[0] for pair in pairs)
         essential = birth - killed
@@ -124,11 +160,11 @@ class PersistenceAlgorithm:  # why is this not a singleton? with complex as a pa
         }
 
     def _compute_persistence_relative(self) -> None:
-        R = self.complex.persistence_data['relative']['reduced_matrix']
+        nonzero = self._nonzero_columns('relative')
         low_inv = self.complex.persistence_data['relative']['pivots']
 
-        birth = set(s for s in R if len(R[s]) == 0)
-        death = set(s for s in R if len(R[s]) != 0)
+        birth = set(s for s in self.complex.boundary if s not in self.complex.sub_complex and s not in nonzero)
+        death = nonzero
         pairs = set((k, v) for k, v in low_inv.items())
         killed = set(pair[0] for pair in pairs)
         essential = birth - killed
@@ -143,56 +179,129 @@ class PersistenceAlgorithm:  # why is this not a singleton? with complex as a pa
     def _compute_persistence_data(self) -> None:
         self.complex.persistence_data = {}
 
-        # TODO (low priority): Only compute what is needed. The prerequisites graph is as follows:
-        #   complex    -R--> image
-        #   complex    -R--> relative
-        #   complex    -RV-> kernel
-        #   complex    -R--> co_kernel
-        #   sub_complex -RV-> co_kernel
+        # TODO (low priority): Only compute what is needed. The prerequisites graph is in REDUCTION_PREREQUISITES.
         # Now user can give a list of desired groups, we add prerequisites to the list
         # and then only compute the data from the list. ! Also need to change compute_persistence !
+        for group in self.REDUCTION_PREREQUISITES:  # the order of the keys respects the prerequisites
+            TimingUtils().start(f"Pers :: Reduce {group}")
+            self.complex.persistence_data[group] = MatrixReduction.reduce(**self._reduction_arguments(group))
+            TimingUtils().stop(f"Pers :: Reduce {group}")
+        self._record_reduction_metrics()
+        self._drop_cycles()
+
+    def _compute_persistence_data_concurrently(self, n_jobs: int) -> None:
+        """Run the reductions in a pool of `n_jobs` processes, submitting each of them as soon as its prerequisites
+        (see REDUCTION_PREREQUISITES) are reduced. The wall time is then bounded by the longest chain of
+        dependent reductions rather than by the sum of all of them.
+
+        The simplices are replaced by their ranks in the total filtration, and the boundary matrix is sent to each
+        worker once, as flat arrays, by `_init_reduction_data`. A task only returns the pivots and counts kept in
+        `persistence_data`, plus the cycles and, for `complex`, the reduced matrix as flat arrays, since the later
+        reductions start from them. The reduced matrices are then not kept in `persistence_data`."""
+        ordered_simplices = [None] * len(self.filters.total_filtration)
+        for simplex, rank in self.filters.total_filtration.items():
+            ordered_simplices[rank] = simplex
+        boundary = _columns_to_arrays({rank: [self.filters.total_filtration[t] for t in self.complex.boundary[s]]
+                                       for rank, s in enumerate(ordered_simplices)})
+        sub_complex = np.array([self.filters.total_filtration[s] for s in self.complex.sub_complex], dtype=int)
+        sub_first_ranks = np.array([self.filters.total_filtration_sub_first[s] for s in ordered_simplices], dtype=int)
 
-        self.complex.persistence_data['complex'] = MatrixReduction.reduce(
-            self.complex.boundary,
-            order_function=self.filters.filter_function_rad(),
-            return_reduction_matrix=True)
-
-        self.complex.persistence_data['sub_complex'] = MatrixReduction.reduce(
-            {simplex: self.complex.boundary[simplex] for simplex in self.complex.sub_complex},  # bnd mat of subcomplex
-            order_function=self.filters.filter_function_rad(),
-            return_reduction_matrix=True)
-
-        self.complex.persistence_data['image'] = MatrixReduction.reduce(
-            self.complex.persistence_data['complex']['reduced_matrix'],  # instead of (self.complex.boundary) for performance
-            order_function=self.filters.filter_function_rad(),
-            order_function_row=self.filters.filter_function_rad_sub_first(),
-            return_reduction_matrix=False)
-
-        R = self.complex.persistence_data['complex']['reduced_matrix']  # should be R_im, but coincides on cycles with R_f
-        V = self.complex.persistence_data['complex']['reduction_matrix']  # should be V_im, but coincides on cycles with V_f
-        self.complex.persistence_data['kernel'] = MatrixReduction.reduce(
-            {simplex: V[simplex] for simplex in V if len(R[simplex]) == 0},  # columns of V which represent cycles
-            order_function=self.filters.filter_function_rad(),
-            order_function_row=self.filters.filter_function_rad_sub_first(),
-            return_reduction_matrix=False)
-
-        Vg = self.complex.persistence_data['sub_complex']['reduction_matrix']
-        Rg = self.complex.persistence_data['sub_complex']['reduced_matrix']
-        Df = self.complex.persistence_data['complex']['reduced_matrix']  # We can take R rather than D, because we only replace
-                                                                         # cycle columns, so all reductions are still valid.
-        D_cok = {simplex: Vg[simplex] if (simplex in Rg and len(Rg[simplex]) == 0) else Df[simplex] for simplex in Df}
-        self.complex.persistence_data['cokernel'] = MatrixReduction.reduce(
-            D_cok,
-            order_function=self.filters.filter_function_rad(),
-            return_reduction_matrix=False)
-
-        matrix_relative = {
-            s: {t for t in self.complex.persistence_data['complex']['reduced_matrix'][s] if t not in self.complex.sub_complex}
-            for s in self.complex.persistence_data['complex']['reduced_matrix'] if s not in self.complex.sub_complex}
-        self.complex.persistence_data['relative'] = MatrixReduction.reduce(
-            matrix_relative,
-            order_function=self.filters.filter_function_rad(),
-            return_reduction_matrix=False)
+        results = {}
+        waiting = list(self.REDUCTION_PREREQUISITES)
+        running = {}
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_reduction_data,
+                                 initargs=(boundary, sub_complex, sub_first_ranks)) as executor:
+            while waiting or running:
+                for group in [g for g in waiting if all(p in results for p in self.REDUCTION_PREREQUISITES[g])]:
+                    waiting.remove(group)
+                    prerequisites = {prerequisite: {key: results[prerequisite][key] for key in keys}
+                                     for prerequisite, keys in self.REDUCTION_PREREQUISITES[group].items()}
+                    running[executor.submit(_reduce_group, group, prerequisites)] = group
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+
+        self.complex.persistence_data = {}
+        for group in self.REDUCTION_PREREQUISITES:
+            rows, columns = results[group]['pivots'].tolist()
+            self.complex.persistence_data[group] = {
+                'pivots': {ordered_simplices[row]: ordered_simplices[column] for row, column in zip(rows, columns)},
+                'column_additions': results[group]['column_additions'],
+                'fill_in': results[group]['fill_in']}
+        self._record_reduction_metrics()
+
+    def _record_reduction_metrics(self) -> None:
+        for group, data in self.complex.persistence_data.items():
+            self.complex.metrics.record(f"Reduction :: {group} :: Column Additions", data['column_additions'])
+            self.complex.metrics.record(f"Reduction :: {group} :: Fill-In", data['fill_in'])
+
+    def _drop_cycles(self) -> None:
+        """The cycles are only needed as input for the kernel and cokernel reductions, so they are dropped to free
+        the memory once these are done."""
+        for group in ('complex', 'sub_complex'):
+            self.complex.persistence_data[group].pop('cycles', None)
+
+    def _reduction_arguments(self, group: str) -> dict:
+        """Return the keyword arguments of MatrixReduction.reduce computing `persistence_data[group]`.
+        Assumes that the prerequisites of `group` are already in `persistence_data`."""
+        return PersistenceAlgorithm.reduction_arguments(group, self.complex.boundary, self.complex.sub_complex,
+                                                        self.complex.persistence_data,
+                                                        self.filters.filter_function_rad(),
+                                                        self.filters.filter_function_rad_sub_first())
+
+    @staticmethod
+    def reduction_arguments(group: str, boundary: dict, sub_complex: set, persistence_data: dict,
+                            order_function, order_function_sub_first) -> dict:
+        """Return the keyword arguments of MatrixReduction.reduce computing `persistence_data[group]` of the complex
+        with the given boundary matrix and sub-complex, where `order_function` is the total filtration and
+        `order_function_sub_first` the order putting the sub-complex first. Only the reduced matrices and cycles of
+        the prerequisites of `group` are read from `persistence_data`."""
+        if group == 'complex':
+            return dict(
+                matrix=boundary,
+                order_function=order_function,
+                return_cycles=True)
+
+        if group == 'sub_complex':
+            return dict(
+                matrix={simplex: boundary[simplex] for simplex in sub_complex},  # bnd mat of subcomplex
+                order_function=order_function,
+                return_cycles=True)
+
+        if group == 'image':
+            return dict(
+                matrix=persistence_data['complex']['reduced_matrix'],  # instead of (boundary) for performance
+                order_function=order_function,
+                order_function_row=order_function_sub_first,
+                return_reduction_matrix=False)
+
+        if group == 'kernel':
+            # Should be cycles of V_im, but it coincides on cycles with V_f.
+            cycles = persistence_data['complex']['cycles']
+            return dict(
+                matrix=cycles,
+                order_function=order_function,
+                order_function_row=order_function_sub_first,
+                return_reduction_matrix=False)
+
+        if group == 'cokernel':
+            cycles_g = persistence_data['sub_complex']['cycles']  # cycle columns of Vg
+            Df = persistence_data['complex']['reduced_matrix']  # We can take R rather than D, because we only replace
+                                                                # cycle columns, so all reductions are still valid.
+            return dict(
+                matrix={simplex: cycles_g.get(simplex, Df[simplex]) for simplex in Df},
+                order_function=order_function,
+                return_reduction_matrix=False)
+
+        if group == 'relative':
+            Rf = persistence_data['complex']['reduced_matrix']
+            return dict(
+                matrix={s: {t for t in Rf[s] if t not in sub_complex}
+                        for s in Rf if s not in sub_complex},
+                order_function=order_function,
+                return_reduction_matrix=False)
+
+        raise ValueError(f"Unknown persistence group `{group}`.")
 
     @staticmethod
     def get_birth_death_from_matrix(R, low_inv) -> dict:
@@ -207,3 +316,51 @@ class PersistenceAlgorithm:  # why is this not a singleton? with complex as a pa
             'death': death,
             'essential': essential
         }
+
+
+_REDUCTION_DATA = {}  # data shared by all reductions, set once per process by `_init_reduction_data`
+
+
+def _init_reduction_data(boundary: tuple[npt.NDArray, npt.NDArray, npt.NDArray], sub_complex: npt.NDArray,
+                         sub_first_ranks: npt.NDArray) -> None:
+    """Initializer of the worker processes of `PersistenceAlgorithm._compute_persistence_data_concurrently`. The
+    simplices are given by their ranks in the total filtration, which is then the natural order of the ranks."""
+    _REDUCTION_DATA.update(boundary=_columns_from_arrays(*boundary), sub_complex=set(sub_complex.tolist()),
+                           sub_first_ranks=sub_first_ranks.tolist())
+
+
+def _reduce_group(group: str, prerequisites: dict[str, dict]) -> dict:
+    """Worker of `PersistenceAlgorithm._compute_persistence_data_concurrently`, reducing the matrix of `group` from
+    the boundary matrix in `_REDUCTION_DATA` and the reduced matrices and cycles of the prerequisites as flat arrays.
+    Return the pivots as a (2, k) array of rows and columns, the counts, and the reduced matrix and cycles read by
+    the later reductions as flat arrays."""
+    persistence_data = {prerequisite: {key: _columns_from_arrays(*arrays) for key, arrays in data.items()}
+                        for prerequisite, data in prerequisites.items()}
+    reduction = MatrixReduction.reduce(**PersistenceAlgorithm.reduction_arguments(
+        group, _REDUCTION_DATA['boundary'], _REDUCTION_DATA['sub_complex'], persistence_data,
+        int, _REDUCTION_DATA['sub_first_ranks'].__getitem__))
+
+    result = {'pivots': np.array([list(reduction['pivots']), list(reduction['pivots'].values())],
+                                 dtype=int).reshape(2, -1),
+              'column_additions': reduction['column_additions'], 'fill_in': reduction['fill_in']}
+    for key in {key for inputs in PersistenceAlgorithm.REDUCTION_PREREQUISITES.values()
+                for key in inputs.get(group, ())}:
+        result[key] = _columns_to_arrays(reduction[key])
+    return result
+
+
+def _columns_to_arrays(columns: dict[int, Iterable[int]]) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+    """Return the columns of ints, keyed by ints, as the arrays (keys, offsets, rows) of a CSR matrix. These are
+    pickled as one buffer each, unlike the sets and tuples of the columns."""
+    lengths = np.fromiter((len(rows) for rows in columns.values()), dtype=int, count=len(columns))
+    offsets = np.zeros(len(columns) + 1, dtype=int)
+    np.cumsum(lengths, out=offsets[1:])
+    rows = np.fromiter(itertools.chain.from_iterable(columns.values()), dtype=int, count=offsets[-1])
+    return np.fromiter(columns, dtype=int, count=len(columns)), offsets, rows
+
+
+def _columns_from_arrays(keys: npt.NDArray, offsets: npt.NDArray, rows: npt.NDArray) -> dict[int, set[int]]:
+    """Inverse of `_columns_to_arrays`."""
+    rows = rows.tolist()
+    return {key: set(rows[start:end])
+            for key, start, end in zip(keys.tolist(), offsets[:-1].tolist(), offsets[1:].tolist())}
@@ -1,5 +1,5 @@
 import itertools
-from typing import Optional
+from typing import Callable, Optional
 
 import numpy as np
 import numpy.typing as npt
@@ -10,38 +10,163 @@ from chromatic_tda.core.core_chromatic_alpha_complex import CoreChromaticAlphaCo
 from chromatic_tda.core.stack import StackOfSpheres
 from chromatic_tda.utils.floating_point_utils import FloatingPointUtils
 from chromatic_tda.utils.geometry_utils import GeometryUtils
+from chromatic_tda.utils.linear_algebra_utils import LinAlgUtils
 from chromatic_tda.utils.timing import TimingUtils
 
 
 class RadiusFunctionConstructor:
     @staticmethod
     def construct_sq_radius_function(alpha_complex: CoreChromaticAlphaComplex,
-                                     use_morse_optimization: bool) -> dict[tuple[int, ...], float]:
+                                     use_morse_optimization: bool,
+                                     simplex_filter: Optional[Callable[[tuple], bool]] = None,
+                                     simplex_key: Optional[Callable[[tuple], tuple]] = None,
+                                     maximal_simplices: Optional[list[tuple[int, ...]]] = None,
+                                     known_sq_radii: Optional[dict[tuple[int, ...], float]] = None) \
+            -> dict[tuple[int, ...], float]:
+        """Return the squared radius function as a dictionary {simplex : squared radius}.
+
+        If `simplex_filter` is given, the radius is only computed for simplices for which it returns True. Other
+        simplices are still used for the emptiness checks of their faces. If `simplex_key` is given, the radii are
+        stored under `simplex_key(simplex)` rather than `simplex`; simplices with equal keys are assumed to have
+        equal radii (e.g. periodic copies of the same simplex on a torus).
+
+        If `maximal_simplices` are given, the complex is assumed to be a skeleton of the complex they generate.
+        The radii of the simplices above the skeleton are then computed first, see `fill_in_above_skeleton`.
+
+        The simplices in `known_sq_radii` are skipped and their given squared radii are used (e.g. the simplices
+        whose star did not change when points are added)."""
         TimingUtils().start("Rad :: Construct Radius Function")
+        if simplex_key is None:
+            simplex_key = RadiusFunctionConstructor._identity
 
-        radius_function = {}
-        for dim in range(alpha_complex.simplicial_complex.dimension, 0, -1):
+        radius_function = {} if known_sq_radii is None else dict(known_sq_radii)
+        top_dimension = alpha_complex.simplicial_complex.dimension
+        top_co_boundary, monotone_radius_above = None, None
+        if maximal_simplices is not None:
+            top_co_boundary, monotone_radius_above = RadiusFunctionConstructor.fill_in_above_skeleton(
+                alpha_complex, maximal_simplices, radius_function, use_morse_optimization)
+        for dim in range(top_dimension, 0, -1):
             simplices: set[tuple[int, ...]] = alpha_complex.simplicial_complex.dim_simplex_dict[dim]
+            co_boundary = (top_co_boundary if top_co_boundary is not None and dim == top_dimension
+                           else alpha_complex.simplicial_complex.co_boundary)
+            pending: dict[tuple, tuple[int, ...]] = {}  # one simplex for each key, in the order of `simplices`
             for simplex in simplices:
-                if radius_function.get(simplex, None) is not None:
+                if simplex_filter is not None and not simplex_filter(simplex):
+                    continue
+                if simplex_key(simplex) in pending or radius_function.get(simplex_key(simplex), None) is not None:
                     continue  # if radius already found at an earlier step, skip the simplex
-                circumstack = RadiusFunctionConstructor.find_smallest_circumstack_of_simplex(
-                    alpha_complex, simplex)
-                extra_vertices = alpha_complex.simplicial_complex.get_extra_vertices_of_cofaces(simplex)
-                if RadiusFunctionConstructor.is_stack_empty_of_vertices(alpha_complex, extra_vertices, circumstack):
-                    radius_function[simplex] = circumstack.maximum_radius
-                    if use_morse_optimization:
-                        RadiusFunctionConstructor.morse_optimization_fill_in_interval(radius_function, alpha_complex,
-                                                                                      simplex, circumstack)
-                else:
-                    co_faces = alpha_complex.simplicial_complex.co_boundary[simplex]
-                    radius_function[simplex] = min(radius_function[co_face] for co_face in co_faces)
+                pending[simplex_key(simplex)] = simplex
+            # the intervals of the Morse optimization only contain faces, so no simplex of `dim` gets filled in
+            circumstacks = RadiusFunctionConstructor.find_smallest_circumstacks_cached(alpha_complex, pending.values())
+            kkt_masks = (RadiusFunctionConstructor.compute_kkt_minimal_vertex_masks(alpha_complex, circumstacks)
+                         if use_morse_optimization else None)
+            is_empty = RadiusFunctionConstructor.are_stacks_empty_of_co_face_vertices(
+                alpha_complex, list(pending.values()), circumstacks, co_boundary)
+            for simplex, simplex_is_empty in zip(pending.values(), is_empty):
+                RadiusFunctionConstructor.fill_in_radius_of_simplex(radius_function, alpha_complex, simplex,
+                                                                    co_boundary.get(simplex, set()),
+                                                                    use_morse_optimization, simplex_key=simplex_key,
+                                                                    circumstack=circumstacks[simplex],
+                                                                    kkt_masks=kkt_masks, is_empty=simplex_is_empty)
         for simplex in alpha_complex.simplicial_complex.get_simplices_of_dim(0):
-            radius_function[simplex] = 0.
+            if simplex_filter is None or simplex_filter(simplex):
+                radius_function[simplex_key(simplex)] = 0.
+        if maximal_simplices is not None:  # drop the simplices above the skeleton
+            for simplex in alpha_complex.simplicial_complex.dim_simplex_dict.get(top_dimension, set()):
+                radius_function[simplex] = np.square(FloatingPointUtils.ensure_smaller_or_equal(
+                    np.sqrt(radius_function[simplex]),
+                    *(monotone_radius_above[co_face] for co_face in top_co_boundary.get(simplex, set()))))
+            radius_function = {simplex: rad2 for simplex, rad2 in radius_function.items()
+                               if len(simplex) <= top_dimension + 1}
 
         TimingUtils().stop("Rad :: Construct Radius Function")
         return radius_function
 
+    @staticmethod
+    def fill_in_radius_of_simplex(radius_function: dict[tuple, float], alpha_complex: CoreChromaticAlphaComplex,
+                                  simplex: tuple, co_faces: set[tuple], use_morse_optimization: bool,
+                                  simplex_key: Callable[[tuple], tuple],
+                                  circumstack: Optional[StackOfSpheres] = None,
+                                  kkt_masks: Optional[dict[tuple, Optional[int]]] = None,
+                                  is_empty: Optional[bool] = None) -> None:
+        """Add the squared radius of `simplex` to `radius_function`, given the radii of all its `co_faces`: the radius
+        of its smallest circumstack if it is empty, and the minimum over the cofaces otherwise. The smallest
+        circumstack, the solution of the KKT conditions of the Morse optimization (as in
+        `compute_kkt_minimal_vertex_masks`) and the emptiness of the circumstack are computed unless given."""
+        if circumstack is None:
+            circumstack = RadiusFunctionConstructor.find_smallest_circumstack_of_simplex(alpha_complex, simplex)
+        if is_empty is None:
+            extra_vertices = [(set(co_face) - set(simplex)).pop() for co_face in co_faces]
+            is_empty = RadiusFunctionConstructor.is_stack_empty_of_vertices(alpha_complex, extra_vertices, circumstack)
+        if is_empty:
+            radius_function[simplex_key(simplex)] = circumstack.maximum_radius
+            if use_morse_optimization and kkt_masks is not None:
+                if kkt_masks[simplex] is not None:
+                    interval = RadiusFunctionConstructor.interval_of_mask(simplex, kkt_masks[simplex])
+                    for interval_simplex in interval:
+                        radius_function[simplex_key(interval_simplex)] = circumstack.maximum_radius
+                    RadiusFunctionConstructor.record_morse_interval(alpha_complex, interval)
+            elif use_morse_optimization:
+                RadiusFunctionConstructor.morse_optimization_fill_in_interval(radius_function, alpha_complex,
+                                                                              simplex, circumstack,
+                                                                              simplex_key=simplex_key)
+        else:
+            radius_function[simplex_key(simplex)] = min(radius_function[simplex_key(co_face)] for co_face in co_faces)
+            alpha_complex.metrics.add("Rad :: Radii From Cofaces")
+
+    @staticmethod
+    def record_morse_interval(alpha_complex: CoreChromaticAlphaComplex, interval: list[tuple, ...]) -> None:
+        if interval:
+            alpha_complex.metrics.add("Rad :: Morse Intervals")
+            alpha_complex.metrics.add("Rad :: Morse Interval Simplices", len(interval))
+
+    @staticmethod
+    def fill_in_above_skeleton(alpha_complex: CoreChromaticAlphaComplex, maximal_simplices: list[tuple[int, ...]],
+                               radius_function: dict[tuple, float], use_morse_optimization: bool) \
+            -> tuple[dict[tuple, set[tuple]], dict[tuple, float]]:
+        """Add to `radius_function` the squared radii of the simplices generated by `maximal_simplices` above the
+        dimension of the complex. The simplices are generated one dimension at a time, and only the radii and
+        co-boundary of the dimension above are kept.
+
+        Return the co-boundary of the top dimension of the complex, and the (not squared) radii of the dimension
+        above it made monotone as in `FloatingPointUtils.ensure_weights_monotonicity_and_equal_values`, which
+        would be applied to the whole complex."""
+        TimingUtils().start("Rad :: Fill In Above Skeleton")
+        top_dimension = alpha_complex.simplicial_complex.dimension
+        dimension = max((len(simplex) - 1 for simplex in maximal_simplices), default=-1)
+        co_boundary, monotone_radius = {}, {}
+        for dim in range(dimension, top_dimension, -1):
+            simplices = {face for simplex in maximal_simplices if len(simplex) > dim
+                         for face in itertools.combinations(simplex, dim + 1)}
+            pending = [simplex for simplex in simplices if radius_function.get(simplex, None) is None]
+            circumstacks = RadiusFunctionConstructor.find_smallest_circumstacks_of_simplices(alpha_complex, pending)
+            kkt_masks = (RadiusFunctionConstructor.compute_kkt_minimal_vertex_masks(alpha_complex, circumstacks)
+                         if use_morse_optimization else None)
+            is_empty = RadiusFunctionConstructor.are_stacks_empty_of_co_face_vertices(alpha_complex, pending,
+                                                                                     circumstacks, co_boundary)
+            for simplex, simplex_is_empty in zip(pending, is_empty):
+                RadiusFunctionConstructor.fill_in_radius_of_simplex(radius_function, alpha_complex, simplex,
+                                                                    co_boundary.get(simplex, set()),
+                                                                    use_morse_optimization,
+                                                                    simplex_key=RadiusFunctionConstructor._identity,
+                                                                    circumstack=circumstacks[simplex],
+                                                                    kkt_masks=kkt_masks, is_empty=simplex_is_empty)
+            monotone_radius = {simplex: FloatingPointUtils.ensure_smaller_or_equal(
+                np.sqrt(radius_function[simplex]),
+                *(monotone_radius[co_face] for co_face in co_boundary.get(simplex, set()))) for simplex in simplices}
+            co_boundary = {}
+            for simplex in simplices:
+                for face in itertools.combinations(simplex, dim):
+                    co_boundary.setdefault(face, set()).add(simplex)
+            for simplex in [s for s in radius_function if len(s) == dim + 2]:  # not needed anymore
+                del radius_function[simplex]
+        TimingUtils().stop("Rad :: Fill In Above Skeleton")
+        return co_boundary, monotone_radius
+
+    @staticmethod
+    def _identity(simplex: tuple) -> tuple:
+        return simplex
+
     @staticmethod
     def is_stack_empty_of_vertices(alpha_complex: CoreChromaticAlphaComplex, vertices, stack: StackOfSpheres) -> bool:
         """Return True if the squared distance from center is greater or close to the corresponding color squared radius
@@ -50,23 +175,186 @@ class RadiusFunctionConstructor:
 
         for v in vertices:
             distance = np.square(alpha_complex.points[v] - stack.center).sum()
-            radius = stack.radii.get(alpha_complex.internal_labeling[v], 0)
+            radius = stack.radii[alpha_complex.internal_labeling[v]]
+            radius = 0 if np.isnan(radius) else radius
             if distance < radius and not FloatingPointUtils.is_close(distance, radius):
+                TimingUtils().stop("Rad :: Check Stack Emptiness")
                 return False
 
         TimingUtils().stop("Rad :: Check Stack Emptiness")
         return True
 
+    @staticmethod
+    def are_stacks_empty_of_co_face_vertices(alpha_complex: CoreChromaticAlphaComplex, simplices: list[tuple],
+                                             circumstacks: dict[tuple, StackOfSpheres],
+                                             co_boundary: dict[tuple, set]) -> list[bool]:
+        """Vectorized `is_stack_empty_of_vertices` for the circumstacks of simplices of one dimension and the extra
+        vertices of their cofaces, gathered in CSR layout by `get_extra_vertices_of_cofaces_csr`."""
+        TimingUtils().start("Rad :: Check Stacks Emptiness")
+        offsets, extra_vertices = alpha_complex.simplicial_complex.get_extra_vertices_of_cofaces_csr(simplices,
+                                                                                                    co_boundary)
+        if len(extra_vertices) == 0:
+            TimingUtils().stop("Rad :: Check Stacks Emptiness")
+            return [True] * len(simplices)
+        centers = np.array([circumstacks[simplex].center for simplex in simplices])
+        radii = np.nan_to_num(np.array([circumstacks[simplex].radii for simplex in simplices]), nan=0)
+        simplex_indices = np.repeat(np.arange(len(simplices)), np.diff(offsets))
+        distances = np.square(alpha_complex.points[extra_vertices] - centers[simplex_indices]).sum(axis=1)
+        pair_radii = radii[simplex_indices, alpha_complex.internal_labeling[extra_vertices]]
+        is_close = np.where(np.abs(pair_radii) > .01, np.isclose(distances, pair_radii),
+                            np.isclose(distances, pair_radii, atol=1e-12))  # as FloatingPointUtils.is_close
+        inside = (distances < pair_radii) & ~is_close
+        is_empty = np.bincount(simplex_indices, weights=inside, minlength=len(simplices)) == 0
+        TimingUtils().stop("Rad :: Check Stacks Emptiness")
+        return is_empty.tolist()
+
     @staticmethod
     def find_smallest_circumstack_of_simplex(alpha_complex: CoreChromaticAlphaComplex,
                                              simplex: tuple) -> StackOfSpheres:
         split = ChromaticComplexUtils.split_simplex_by_labels(simplex, alpha_complex.internal_labeling)
-        labels, vertex_sets = zip(*split.items())
-        point_sets = [alpha_complex.points[vertex_set] for vertex_set in vertex_sets]
-        center, radii = RadiusFunctionConstructor.find_smallest_circumstack(*point_sets)
-        circumstack = StackOfSpheres(center, {lab: rad for lab, rad in zip(labels, radii)})
+        point_sets = [alpha_complex.points[split[lab]] for lab in sorted(split)]
+        center, radii2 = RadiusFunctionConstructor.find_smallest_circumstack(*point_sets)
+        radii = np.full(alpha_complex.labels_number, np.nan)
+        radii[sorted(split)] = radii2
+        circumstack = StackOfSpheres(center, radii)
         return circumstack
 
+    @staticmethod
+    def find_smallest_circumstacks_cached(alpha_complex: CoreChromaticAlphaComplex,
+                                          simplices: Iterable[tuple]) -> dict[tuple, StackOfSpheres]:
+        """Return {simplex : smallest circumstack} as `find_smallest_circumstacks_of_simplices`, looking the simplices
+        up in `alpha_complex.circumstack_cache` first if there is one, and adding the computed circumstacks to it.
+        The circumstack only depends on the vertices of the simplex, so the cache pays off in the incremental mode,
+        where `add_points` computes the radii of the simplices whose star changed again."""
+        cache = alpha_complex.circumstack_cache
+        if cache is None:
+            return RadiusFunctionConstructor.find_smallest_circumstacks_of_simplices(alpha_complex, simplices)
+        circumstacks, missing = {}, []
+        for simplex in simplices:
+            circumstack = cache.get(simplex)
+            if circumstack is None:
+                missing.append(simplex)
+            else:
+                circumstacks[simplex] = circumstack
+        computed = RadiusFunctionConstructor.find_smallest_circumstacks_of_simplices(alpha_complex, missing)
+        for simplex, circumstack in computed.items():
+            cache.put(simplex, circumstack)
+        circumstacks.update(computed)
+        return circumstacks
+
+    @staticmethod
+    def find_smallest_circumstacks_of_simplices(alpha_complex: CoreChromaticAlphaComplex,
+                                                simplices: Iterable[tuple]) -> dict[tuple, StackOfSpheres]:
+        """Return {simplex : smallest circumstack} for the given simplices, as `find_smallest_circumstack_of_simplex`.
+
+        The simplices of each size are split by the labels at once by `ChromaticComplexUtils.split_simplices_by_labels`
+        and grouped by their color counts. Each group is computed at once by the vectorized kernel of its color-split
+        pattern, i.e., the sizes of the color classes, in `CIRCUMSTACK_KERNELS`, or by `circumstacks_general` if there
+        is none. The simplices for which a kernel meets a degenerate linear equation are computed by
+        `find_smallest_circumstack_of_simplex`."""
+        TimingUtils().start("Rad :: Find Smallest Circumstacks Of Simplices")
+        circumstacks = {}
+        pending_by_size: dict[int, list[tuple]] = {}
+        for simplex in simplices:
+            pending_by_size.setdefault(len(simplex), []).append(simplex)
+
+        for pending in pending_by_size.values():
+            simplex_array = np.array(pending, dtype=int)
+            permutation, offsets = ChromaticComplexUtils.split_simplices_by_labels(
+                simplex_array, alpha_complex.internal_labeling, alpha_complex.labels_number)
+            sorted_points = alpha_complex.points[np.take_along_axis(simplex_array, permutation, axis=1)]
+            color_counts, group_of_rows = np.unique(np.diff(offsets, axis=1), axis=0, return_inverse=True)
+            for group, counts in enumerate(color_counts):
+                rows = np.flatnonzero(group_of_rows.ravel() == group)
+                present_labels = np.flatnonzero(counts)
+                pattern = tuple(counts[present_labels].tolist())
+                kernel = RadiusFunctionConstructor.CIRCUMSTACK_KERNELS.get(
+                    pattern, RadiusFunctionConstructor.circumstacks_general)
+                centers, radii2 = kernel(*np.split(sorted_points[rows], np.cumsum(pattern)[:-1], axis=1))
+                degenerate = np.isnan(centers).any(axis=1)
+                alpha_complex.metrics.add("Rad :: Computed Circumstacks", len(rows))
+                alpha_complex.metrics.add("Rad :: Degenerate Circumstacks", int(degenerate.sum()))
+                radii = np.full((len(rows), alpha_complex.labels_number), np.nan)
+                radii[:, present_labels] = radii2
+                radii[degenerate] = 0  # replaced by the generic solver below
+                for row, is_degenerate, circumstack in zip(rows.tolist(), degenerate.tolist(),
+                                                           StackOfSpheres.stacks_from_arrays(centers, radii)):
+                    simplex = pending[row]
+                    if is_degenerate:
+                        circumstacks[simplex] = RadiusFunctionConstructor.find_smallest_circumstack_of_simplex(
+                            alpha_complex, simplex)
+                    else:
+                        circumstacks[simplex] = circumstack
+        TimingUtils().stop("Rad :: Find Smallest Circumstacks Of Simplices")
+        return circumstacks
+
+    @staticmethod
+    def circumstacks_of_edges(*point_sets: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
+        """Kernel for edges (mono- or bi-chromatic), given as arrays of shape (m, 2, d) or twice (m, 1, d): the center
+        is the midpoint and each squared radius is a quarter of the squared length."""
+        points = np.concatenate(point_sets, axis=1)
+        centers = points.mean(axis=1)
+        radii2 = np.square(points[:, 1] - points[:, 0]).sum(axis=1) / 4
+        return centers, np.repeat(radii2[:, np.newaxis], len(point_sets), axis=1)
+
+    @staticmethod
+    def circumstacks_of_monochromatic_simplices(points: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
+        """Kernel for mono-chromatic simplices, given as an array of shape (m, k, d): the center is the circumcenter
+        in the affine hull of the simplex."""
+        centers = GeometryUtils.circumcenters_of_weighted_points(points, np.zeros(points.shape[:2]))
+        radii2 = np.square(points[:, 0] - centers).sum(axis=1)
+        return centers, radii2[:, np.newaxis]
+
+    @staticmethod
+    def circumstacks_general(*point_sets: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
+        """Vectorized `find_smallest_circumstack_weighted_circumspheres` for point sets B_0, ..., B_k given as arrays
+        of shape (m, |B_i|, d). Return the centers (shape (m, d)) and squared radii (shape (m, k + 1)); the centers
+        are NaN where a linear equation is degenerate."""
+        TimingUtils().start("Rad :: Find Smallest Circumstack :: Vectorized")
+        number_of_simplices, dim = point_sets[0].shape[0], point_sets[0].shape[2]
+        points = np.stack([point_set[:, 0] for point_set in point_sets], axis=1)  # each set projects to a single point
+
+        # equispace: 2 (q - p) . z = |q|^2 - |p|^2 for the points q of each set B_i other than its first point p
+        a_mats = np.concatenate([2 * (point_set[:, 1:] - point_set[:, :1]) for point_set in point_sets], axis=1)
+        b_vecs = np.concatenate([np.square(point_set[:, 1:]).sum(axis=2) - np.square(point_set[:, :1]).sum(axis=2)
+                                 for point_set in point_sets], axis=1)
+        degenerate = np.zeros(number_of_simplices, dtype=bool)
+        if a_mats.shape[1] == 0:
+            points_projected = points
+        else:  # x - A^T (A A^T)^-1 (A x - b) is the orthogonal projection of x to the equispace
+            residuals = np.einsum('mid,mkd->mki', a_mats, points) - b_vecs[:, np.newaxis, :]
+            gram_mats = a_mats @ a_mats.transpose(0, 2, 1)
+            y = np.stack([LinAlgUtils.solve_stacked(gram_mats, residuals[:, k]) for k in range(len(point_sets))],
+                         axis=1)
+            points_projected = points - np.einsum('mki,mid->mkd', y, a_mats)
+            degenerate |= np.isnan(points_projected).any(axis=(1, 2))
+        weights = np.square(points - points_projected).sum(axis=2)
+
+        centers = np.full((number_of_simplices, dim), np.nan)
+        radii2 = np.full((number_of_simplices, len(point_sets)), np.nan)
+        max_radii2 = np.full(number_of_simplices, np.inf)
+        for k in range(1, dim - a_mats.shape[1] + 2):
+            for choice in itertools.combinations(range(len(point_sets)), k):
+                choice_centers = GeometryUtils.circumcenters_of_weighted_points(points_projected[:, list(choice)],
+                                                                               weights[:, list(choice)])
+                choice_radii2 = np.square(points - choice_centers[:, np.newaxis, :]).sum(axis=2)
+                degenerate |= np.isnan(choice_centers).any(axis=1)
+                better = choice_radii2.max(axis=1) < max_radii2
+                centers[better], radii2[better] = choice_centers[better], choice_radii2[better]
+                max_radii2[better] = choice_radii2[better].max(axis=1)
+        centers[degenerate] = np.nan
+
+        TimingUtils().stop("Rad :: Find Smallest Circumstack :: Vectorized")
+        return centers, radii2
+
+    CIRCUMSTACK_KERNELS: dict[tuple[int, ...], Callable[..., tuple[npt.NDArray, npt.NDArray]]] = {
+        (2,): circumstacks_of_edges,
+        (1, 1): circumstacks_of_edges,
+        (3,): circumstacks_of_monochromatic_simplices,
+        (4,): circumstacks_of_monochromatic_simplices,
+        (5,): circumstacks_of_monochromatic_simplices,
+    }
+
     @staticmethod
     def find_smallest_circumstack(*point_sets: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
         """For arguments B_0, ..., B_k, return the center z and radii r_0, ..., r_k defining a stack of spheres
@@ -143,7 +431,7 @@ class RadiusFunctionConstructor:
         WARNING: `points` is assumed to be all points that `circumstack` goes through --- if not the case,
                  solution might not exist, and None is returned"""
         TimingUtils().start("Rad :: Morse :: Compute KKT Solution")
-        labels_to_int = {lab: i for i, lab in enumerate(circumstack.radii.keys())}
+        labels_to_int = {lab: i for i, lab in enumerate(circumstack.labels.tolist())}
         number_of_labels = len(labels_to_int)
         point_part = np.array([
             np.concatenate([np.eye(1, number_of_labels + 1, k=labels_to_int[lab]).flatten(), pt])
@@ -164,28 +452,86 @@ class RadiusFunctionConstructor:
         else:
             return x[:len(point_part)]
 
+    @staticmethod
+    def compute_kkt_minimal_vertex_masks(alpha_complex: CoreChromaticAlphaComplex,
+                                         circumstacks: dict[tuple, StackOfSpheres]) -> dict[tuple, Optional[int]]:
+        """Batched `compute_kkt_solution` for the simplices with the given circumstacks. Return {simplex : mask}, where
+        the bits of mask are the positions of the vertices in the simplex with strictly positive lambda, or None if
+        there is no valid solution. The equations of the simplices with the same number of vertices, labels and
+        maximum labels have the same shape and are solved together by `LinAlgUtils.solve_batch`."""
+        TimingUtils().start("Rad :: Morse :: Compute KKT Solutions")
+        groups: dict[tuple[int, int, int], list[tuple]] = {}
+        for simplex, circumstack in circumstacks.items():
+            shape = (len(simplex), len(circumstack.labels), len(circumstack.maximum_labels))
+            groups.setdefault(shape, []).append(simplex)
+
+        kkt_masks = {}
+        for (number_of_vertices, number_of_labels, number_of_maximum_labels), simplices in groups.items():
+            # columns: lambda of each vertex, then mu of each maximum label; rows: labels, sum of mu, coordinates
+            simplex_array = np.array(simplices, dtype=int)
+            simplex_rows = np.arange(len(simplices))[:, np.newaxis]
+            # the row of each label of a stack is its position among the labels of the stack
+            label_positions = np.cumsum(~np.isnan([circumstacks[simplex].radii for simplex in simplices]), axis=1) - 1
+            label_rows = label_positions[simplex_rows, alpha_complex.internal_labeling[simplex_array]]
+            maximum_label_rows = label_positions[simplex_rows, np.array(
+                [circumstacks[simplex].maximum_labels for simplex in simplices], dtype=int).reshape(len(simplices), -1)]
+            a_mats = np.zeros((len(simplices), number_of_labels + 1 + alpha_complex.points_dimension,
+                               number_of_vertices + number_of_maximum_labels))
+            a_mats[simplex_rows, label_rows, np.arange(number_of_vertices)] = 1
+            a_mats[:, number_of_labels + 1:, :number_of_vertices] = \
+                alpha_complex.points[simplex_array].transpose(0, 2, 1)
+            a_mats[simplex_rows, maximum_label_rows, number_of_vertices + np.arange(number_of_maximum_labels)] = -1
+            a_mats[:, number_of_labels, number_of_vertices:] = 1
+            b_vecs = np.zeros(a_mats.shape[:2])
+            b_vecs[:, number_of_labels] = 1
+            b_vecs[:, number_of_labels + 1:] = [circumstacks[simplex].center for simplex in simplices]
+
+            x, _ = LinAlgUtils.solve_batch(a_mats, b_vecs)
+            valid = np.square(np.einsum('nij,nj->ni', a_mats, x) - b_vecs).sum(axis=1) <= 1e-12  # as is_close(res, 0)
+            masks = (x[:, :number_of_vertices] > 0) @ (1 << np.arange(number_of_vertices))
+            for simplex, is_valid, mask in zip(simplices, valid.tolist(), masks.tolist()):
+                kkt_masks[simplex] = mask if is_valid else None
+        TimingUtils().stop("Rad :: Morse :: Compute KKT Solutions")
+        return kkt_masks
+
     @staticmethod
     def generate_radius_function_interval(simplex: tuple, coefficients: Iterable) -> list[tuple, ...]:
         """Return a list of simplices [min, simplex] - simplex, where min are all the vertices for which
-        the corresponding coefficient is strictly positive."""
+        the corresponding coefficient is strictly positive. The simplices are sorted, the simplex need not be."""
         TimingUtils().start("Rad :: Morse :: Generate Interval Simplices")
-        minimal_simplex = {v for v, coef in zip(simplex, coefficients) if coef > 0}
-        non_positive_vertices = set(simplex) - minimal_simplex
-        interval = [tuple(sorted(minimal_simplex.union(extra)))
-                    for k in range(len(non_positive_vertices))
-                    for extra in itertools.combinations(non_positive_vertices, k)]
+        order = np.argsort(simplex, kind='stable')  # sorts the vertices and their coefficients together
+        sorted_coefficients = np.fromiter(coefficients, dtype=float, count=len(simplex))[order]
+        minimal_mask = sum(1 << i for i, coef in enumerate(sorted_coefficients.tolist()) if coef > 0)
+        interval = RadiusFunctionConstructor.interval_of_mask(tuple(np.asarray(simplex)[order].tolist()), minimal_mask)
         TimingUtils().stop("Rad :: Morse :: Generate Interval Simplices")
         return interval
 
+    _interval_positions: dict[tuple[int, int], list[tuple[int, ...]]] = {}
+
+    @staticmethod
+    def interval_of_mask(simplex: tuple, minimal_mask: int) -> list[tuple, ...]:
+        """Return the simplices [min, simplex] - simplex, where min are the vertices at the positions of the bits of
+        `minimal_mask`. The positions of the faces of each interval are computed once for each size of the simplex."""
+        positions = RadiusFunctionConstructor._interval_positions.get((len(simplex), minimal_mask), None)
+        if positions is None:
+            full_mask = (1 << len(simplex)) - 1
+            positions = [tuple(i for i in range(len(simplex)) if mask >> i & 1) for mask in range(full_mask)
+                         if mask & minimal_mask == minimal_mask]
+            RadiusFunctionConstructor._interval_positions[(len(simplex), minimal_mask)] = positions
+        return [tuple(simplex[i] for i in face_positions) for face_positions in positions]
+
     @staticmethod
     def morse_optimization_fill_in_interval(radius_function: dict[tuple, float],
                                             alpha_complex: CoreChromaticAlphaComplex,
                                             simplex: tuple,
-                                            circumstack: StackOfSpheres) -> None:
+                                            circumstack: StackOfSpheres,
+                                            simplex_key: Optional[Callable[[tuple], tuple]] = None) -> None:
         points, labels = zip(*[(alpha_complex.points[v], alpha_complex.internal_labeling[v])
                                for v in simplex])
         lambdas = RadiusFunctionConstructor.compute_kkt_solution(points, labels, circumstack)
         if lambdas is not None:
             interval = RadiusFunctionConstructor.generate_radius_function_interval(simplex, lambdas)
             for interval_simplex in interval:
-                radius_function[interval_simplex] = circumstack.maximum_radius
+                radius_function[simplex_key(interval_simplex) if simplex_key is not None
+                                else interval_simplex] = circumstack.maximum_radius
+            RadiusFunctionConstructor.record_morse_interval(alpha_complex, interval)
@@ -1,35 +1,56 @@
 
 class MatrixReduction:
     @staticmethod
-    def reduce(matrix, order_function, order_function_row = None, return_reduction_matrix = False):
+    def reduce(matrix, order_function, order_function_row = None, return_reduction_matrix = False,
+               return_cycles = False):
         """
         Reduce given matrix. Using `order_function` to order columns.
         If `order_function_row` is given, it is used to order rows,
         otherwise `order_function` is also used for rows.
         The matrix is copied, i.e., given `matrix` remains unchanged.
 
+        If `return_cycles` is True, a basis of cycles {s : cycle} is returned, where `s` runs over the zero columns of
+        the reduced matrix and `cycle` is the column s of V, which has its lowest element at `s`. Only these columns
+        of V are kept after the reduction. V is still built for all columns during the reduction, since the column of
+        V of a nonzero column is added to the later columns reduced by it, so this only reduces the memory retained
+        after the reduction, not its peak. A killed cycle could also be represented by the column of the reduced
+        matrix killing it, but the columns of V make much cheaper input for the reductions taking the cycles (e.g.
+        a cycle {s} of dimension 0 instead of an edge). Only meaningful for a square boundary matrix ordered by one
+        `order_function`.
+
         Returns a dictionary with the following keys:
             reduced_matrix ... the reduced boundary matrix
             pivots ... pivots of the reduced matrix as a dictionary: row indices as keys and column indices as values
+            column_additions ... number of column additions performed by the reduction
+            fill_in ... number of nonzero entries of the reduced matrix minus that of the given matrix
             reduction_matrix (if return_reduction_matrix=True) ... the matrix V s.t. reduced_matrix = matrix * V
+            cycles (if return_cycles=True) ... basis of cycles described above
         """
+        if return_cycles and order_function_row is not None:
+            raise ValueError("Cycles can only be returned if columns and rows are ordered by the same function.")
         if order_function_row is None:
             order_function_row = order_function
         R = {k : v for k, v in matrix.items()}
-        if return_reduction_matrix:
-            V = {k : {k} for k in matrix}
+        V = {k : {k} for k in matrix} if return_reduction_matrix or return_cycles else None
         low_inv = {}  # low_inv[i]=index of column with the lowest 1 at i
-        for s in sorted(R, key=order_function):
+        column_additions = 0
+        columns = sorted(R, key=order_function)
+        for s in columns:
             t = low_inv.get(max(R[s], key=order_function_row), -1) if len(R[s]) != 0 else -1
             while t != -1:
                 R[s] = R[t] ^ R[s]  # symmetric difference of t-th and s-th columns
-                if return_reduction_matrix:
+                if V is not None:
                     V[s] = V[t] ^ V[s]
+                column_additions += 1
                 t = low_inv.get(max(R[s], key=order_function_row), -1) if len(R[s]) != 0 else -1
             if len(R[s]) != 0:
-                low_inv[max(R[s], key=order_function_row)] = s
+                pivot = max(R[s], key=order_function_row)
+                low_inv[pivot] = s
 
-        return_dictionary = {'reduced_matrix': R, 'pivots': low_inv}
+        return_dictionary = {'reduced_matrix': R, 'pivots': low_inv, 'column_additions': column_additions,
+                             'fill_in': sum(map(len, R.values())) - sum(map(len, matrix.values()))}
         if return_reduction_matrix:
             return_dictionary['reduction_matrix'] = V
+        if return_cycles:
+            return_dictionary['cycles'] = {s: V[s] for s in columns if len(R[s]) == 0}
         return return_dictionary
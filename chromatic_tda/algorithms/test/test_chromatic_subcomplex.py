@@ -1,6 +1,9 @@
 import unittest
 
+import numpy as np
+
 from chromatic_tda import ChromaticAlphaComplex
+from chromatic_tda.algorithms.chromatic_subcomplex_utils import ChromaticComplexUtils
 from chromatic_tda.entities.simplicial_complex import SimplicialComplex
 
 
@@ -157,3 +160,15 @@ class ComplexTest(unittest.TestCase):
 
         assert len(simplicial_complex.simplices()) > 0
         assert len(simplicial_complex.simplices_sub_complex()) == 0
+
+    def test_split_simplices_by_labels_same_as_split_simplex(self) -> None:
+        rng = np.random.default_rng(0)
+        labeling = rng.integers(0, 4, 30)
+        simplices = np.sort(rng.choice(30, (50, 5)), axis=1)
+        permutation, offsets = ChromaticComplexUtils.split_simplices_by_labels(simplices, labeling, 4)
+        sorted_simplices = np.take_along_axis(simplices, permutation, axis=1)
+
+        for simplex, sorted_simplex, simplex_offsets in zip(simplices, sorted_simplices, offsets):
+            split = ChromaticComplexUtils.split_simplex_by_labels(tuple(simplex), labeling)
+            for lab in range(4):
+                assert list(sorted_simplex[simplex_offsets[lab]:simplex_offsets[lab + 1]]) == split.get(lab, [])
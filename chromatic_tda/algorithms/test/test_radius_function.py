@@ -94,4 +94,40 @@ class RadiusFunctionTest(unittest.TestCase):
 
         assert np.isclose((pt1 + pt2) / 2, c).all()
         assert np.isclose(np.linalg.norm(pt1 - pt2) / 2, r[0])
-        assert np.isclose(np.linalg.norm(pt1 - pt2) / 2, r[1])
\ No newline at end of file
+        assert np.isclose(np.linalg.norm(pt1 - pt2) / 2, r[1])
+    def test_vectorized_circumstacks_same_as_generic(self):
+        rng = np.random.default_rng(0)
+        points = rng.random((80, 3))
+        labels = rng.integers(0, 3, 80)
+        alpha_complex = CoreChromaticAlphaComplexFactory(points, labels).create_instance(lift_perturbation=1e-9,
+                                                                                         point_perturbation=None)
+        simplices = [s for s in alpha_complex.simplicial_complex.get_simplices() if len(s) > 1]
+        circumstacks = RadiusFunctionConstructor.find_smallest_circumstacks_of_simplices(alpha_complex, simplices)
+        for simplex in simplices:
+            circumstack = RadiusFunctionConstructor.find_smallest_circumstack_of_simplex(alpha_complex, simplex)
+            assert np.isclose(circumstacks[simplex].center, circumstack.center).all()
+            assert np.isclose(circumstacks[simplex].radii, circumstack.radii, equal_nan=True).all()
+            assert (circumstacks[simplex].maximum_labels == circumstack.maximum_labels).all()
+
+    def test_vectorized_circumstacks_degenerate_fallback(self):
+        centers, radii2 = RadiusFunctionConstructor.circumstacks_general(np.array([[[0., 0.], [1., 0.], [2., 0.]]]),
+                                                                         np.array([[[0., 1.]]]))
+        assert np.isnan(centers).all()
+
+    def test_morse_optimization_same_as_without(self):
+        rng = np.random.default_rng(1)
+        points = rng.random((100, 2))
+        labels = rng.integers(0, 3, 100)
+        weights = [CoreChromaticAlphaComplexFactory(points, labels).create_instance(
+            lift_perturbation=1e-9, point_perturbation=None, use_morse_optimization=use_morse_optimization
+        ).simplicial_complex.get_weight_function_copy() for use_morse_optimization in [True, False]]
+        assert set(weights[0]) == set(weights[1])
+        assert all(np.isclose(weights[0][s], weights[1][s]) for s in weights[0])
+
+    def test_interval_of_mask(self):
+        interval = RadiusFunctionConstructor.generate_radius_function_interval((2, 5, 7, 9), [.5, 0, .5, -.1])
+        assert sorted(interval) == [(2, 5, 7), (2, 7), (2, 7, 9)]
+        unsorted_interval = RadiusFunctionConstructor.generate_radius_function_interval((7, 2, 9, 5),
+                                                                                        [.5, .5, -.1, 0])
+        assert sorted(unsorted_interval) == sorted(interval)
+        assert RadiusFunctionConstructor.interval_of_mask((2, 5, 7, 9), 0b1111) == []
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+
+from chromatic_tda import ChromaticAlphaComplex, Metrics
+from chromatic_tda.algorithms.persistence_algorithm import PersistenceAlgorithm
+from chromatic_tda.algorithms.reduce_matrix import MatrixReduction
+
+
+class MatrixReductionTest(unittest.TestCase):
+
+    @staticmethod
+    def random_alpha_complex(seed=0, n=60):
+        rng = np.random.default_rng(seed)
+        points = rng.random((n, 2))
+        labels = rng.integers(0, 2, n)
+        return ChromaticAlphaComplex(points, labels)
+
+    def test_cycles_have_lowest_element_at_zero_columns(self):
+        cplx = self.random_alpha_complex(seed=3).get_simplicial_complex()
+        boundary = cplx.core_complex.boundary
+        order = {s: i for i, s in enumerate(sorted(boundary, key=lambda s: (len(s), s)))}
+        result = MatrixReduction.reduce(boundary, order_function=order.get, return_cycles=True)
+
+        assert 'reduction_matrix' not in result
+        assert set(result['cycles']) == {s for s in boundary if len(result['reduced_matrix'][s]) == 0}
+        for s, cycle in result['cycles'].items():
+            assert max(cycle, key=order.get) == s
+            assert len(cplx.core_complex.chain_boundary(cycle)) == 0
+
+    def test_concurrent_groups_same_six_pack(self):
+        alpha_complex = self.random_alpha_complex(seed=2)
+        cplx = alpha_complex.get_simplicial_complex(sub_complex='mono-chromatic')
+        cplx_concurrent = alpha_complex.get_simplicial_complex(sub_complex='mono-chromatic')
+        cplx.compute_persistence()
+        cplx_concurrent.compute_persistence(n_jobs=3)
+
+        assert cplx.bars_six_pack(return_as='list') == cplx_concurrent.bars_six_pack(return_as='list')
+        for group, data in cplx_concurrent.core_complex.persistence_data.items():
+            assert set(data) == {'pivots', 'column_additions', 'fill_in'}  # no matrices sent back from the workers
+            for key in data:
+                assert data[key] == cplx.core_complex.persistence_data[group][key]
+
+    def test_column_additions_and_fill_in(self):
+        boundary = {(0,): set(), (1,): set(), (2,): set(), (0, 1): {(0,), (1,)}, (0, 2): {(0,), (2,)},
+                    (1, 2): {(1,), (2,)}, (0, 1, 2): {(0, 1), (0, 2), (1, 2)}}
+        reduction = MatrixReduction.reduce(boundary, order_function=lambda s: (len(s), s))
+        assert reduction['column_additions'] == 2  # (1, 2) + (0, 2) + (0, 1) = 0
+        assert reduction['fill_in'] == -2
+
+    def test_metrics_recorded(self):
+        Metrics.enable()
+        try:
+            alpha = self.random_alpha_complex(seed=4)
+            cplx = alpha.get_simplicial_complex(sub_complex='mono-chromatic')
+            cplx.compute_persistence()
+        finally:
+            Metrics.disable()
+        for dim in range(cplx.dimension() + 1):
+            assert alpha.metrics()[f"Complex :: Simplices Of Dim {dim}"] == len(cplx.simplices_of_dim(dim))
+        assert set(cplx.metrics()) == {f"Reduction :: {group} :: {name}" for group in cplx.GROUPS
+                                       for name in ("Column Additions", "Fill-In")}
+        assert self.random_alpha_complex(seed=4).metrics() == {}
+
+    def test_cokernel_column_additions_same_as_with_reduction_matrix(self):
+        rng = np.random.default_rng(5)
+        cplx = ChromaticAlphaComplex(rng.random((300, 2)), rng.integers(0, 3, 300)).get_simplicial_complex(
+            sub_complex='bi-chromatic')
+        cplx.compute_persistence()
+        core = cplx.core_complex
+        order = PersistenceAlgorithm(core).filters.filter_function_rad()
+        sub_boundary = {simplex: core.boundary[simplex] for simplex in core.sub_complex}
+        reduction_g = MatrixReduction.reduce(sub_boundary, order_function=order, return_reduction_matrix=True)
+        Rf = core.persistence_data['complex']['reduced_matrix']
+        matrix = {simplex: reduction_g['reduction_matrix'][simplex]
+                  if simplex in sub_boundary and len(reduction_g['reduced_matrix'][simplex]) == 0 else Rf[simplex]
+                  for simplex in Rf}
+
+        reference = MatrixReduction.reduce(matrix, order_function=order)
+        assert core.persistence_data['cokernel']['column_additions'] <= reference['column_additions']
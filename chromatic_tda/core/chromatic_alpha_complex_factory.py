@@ -1,24 +1,54 @@
-from typing import Optional
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
 
 import numpy as np
 import numpy.typing as npt
 import random
-from scipy.spatial import Delaunay
+from scipy.spatial import ConvexHull, Delaunay, KDTree, QhullError
 
+from chromatic_tda.algorithms.chromatic_subcomplex_utils import ChromaticComplexUtils
 from chromatic_tda.algorithms.radius_function import RadiusFunctionConstructor
 from chromatic_tda.utils.boundary_matrix_utils import BoundaryMatrixUtils
 from chromatic_tda.core.core_chromatic_alpha_complex import CoreChromaticAlphaComplex
+from chromatic_tda.utils.lru_cache import LRUCache
 from chromatic_tda.algorithms.legacy_radius_function_utils import LegacyRadiusFunctionUtils
 from chromatic_tda.core.simplicial_complex_factory import CoreSimplicialComplexFactory
+from chromatic_tda.utils.geometry_utils import GeometryUtils
+from chromatic_tda.utils.profiler import Profiler
 from chromatic_tda.utils.timing import TimingUtils
 
 
 class CoreChromaticAlphaComplexFactory:
+    CIRCUMSTACK_CACHE_SIZE = 2 ** 16  # a cached circumstack takes about 1 KB
 
-    def __init__(self, points, labels):
+    def __init__(self, points, labels, tiles=None, n_jobs=1, chromatic_pattern=None, max_radius=None,
+                 max_homology_dim=None, qhull_options=None, delaunay_simplices=None,
+                 delaunay_backend: Optional[Callable[[npt.NDArray], npt.NDArray]] = None, incremental=False):
         self.points = np.array(points, dtype='d')
         self.labels = labels
         self.check_input()
+        if delaunay_simplices is not None and (tiles is not None or chromatic_pattern is not None):
+            raise ValueError("The Delaunay simplices cannot be given together with tiles or chromatic_pattern.")
+        if delaunay_backend is not None and tiles is not None:
+            raise ValueError("The tiled Delaunay computation only supports the Qhull backend.")
+        if incremental and any(option is not None for option in (tiles, chromatic_pattern, max_radius, max_homology_dim,
+                                                                 delaunay_simplices, delaunay_backend)):
+            raise ValueError("The incremental mode does not support tiles, chromatic_pattern, max_radius, "
+                             "max_homology_dim, delaunay_simplices or delaunay_backend.")
+        self.qhull_options = qhull_options  # None for the defaults of scipy
+        self.delaunay_simplices = delaunay_simplices  # precomputed maximal simplices (indices of points), or None
+        self.delaunay_backend = delaunay_backend  # function from lifted points to the array of Delaunay simplices
+        self.incremental = incremental  # keep the Delaunay triangulation for `add_points`
+        self.delaunay = None  # the incremental Delaunay triangulation of the chromatic lift
+        self.maximal_simplices_of_vertex = None  # the maximal simplices containing each vertex, in incremental mode
+        self.instance_parameters = {}  # the parameters of `create_instance`, reused by `add_points`
+        self.tiles = tiles  # number of tiles along each axis (int or one int per axis), None for a single Delaunay
+        self.n_jobs = n_jobs
+        self.chromatic_pattern = chromatic_pattern  # only simplices with labels in one of the sets, None for all
+        self.max_radius = max_radius  # only simplices with radius at most max_radius are kept, None for all
+        self.max_homology_dim = max_homology_dim  # only simplices up to dimension max_homology_dim + 1, None for all
+        self.maximal_simplices = None  # of the whole complex, kept if max_homology_dim or incremental
         self.alpha_complex = None
 
     def create_instance(self, lift_perturbation: Optional[float],
@@ -28,18 +58,38 @@ class CoreChromaticAlphaComplexFactory:
         """
         Compute the chromatic alpha complex of given points and labels.
         """
+        if legacy_radius_function and self.max_homology_dim is not None:
+            raise ValueError("The legacy radius function needs the whole complex, it cannot be used with "
+                             "max_homology_dim.")
         TimingUtils().start("AlphFac :: Create Alf Instance")
         self.alpha_complex = CoreChromaticAlphaComplex()
+        if self.incremental:
+            self.alpha_complex.circumstack_cache = LRUCache(self.CIRCUMSTACK_CACHE_SIZE,
+                                                            topic="Rad :: Circumstack Cache",
+                                                            metrics=self.alpha_complex.metrics)
+        self.instance_parameters = dict(lift_perturbation=lift_perturbation, point_perturbation=point_perturbation,
+                                        use_morse_optimization=use_morse_optimization)
 
         self.init_points(self.points, point_perturbation)
         self.init_labels(self.labels)
         self.build_alpha_complex_structure(lift_perturbation=lift_perturbation)
         self.add_radius_function(use_morse_optimization=use_morse_optimization,
                                  legacy_radius_function=legacy_radius_function)
-        TimingUtils().start("AlphFac :: Create Alf Instance")
+        self.restrict_to_max_radius()
+        self.alpha_complex.simplicial_complex.max_homology_dim = self.max_homology_dim
+        self.record_complex_metrics()
+        TimingUtils().stop("AlphFac :: Create Alf Instance")
 
         return self.alpha_complex
 
+    def record_complex_metrics(self) -> None:
+        """Record the numbers of points, labels and simplices of each dimension in `alpha_complex.metrics`."""
+        metrics = self.alpha_complex.metrics
+        metrics.record("Complex :: Points", len(self.alpha_complex.points))
+        metrics.record("Complex :: Labels", self.alpha_complex.labels_number)
+        for dim, simplices in self.alpha_complex.simplicial_complex.dim_simplex_dict.items():
+            metrics.record(f"Complex :: Simplices Of Dim {dim}", len(simplices))
+
     def init_points(self, points, point_perturbation: Optional[float]) -> None:
         if point_perturbation:
             self.alpha_complex.points = np.array(self.perturb_points(points, point_perturbation))
@@ -56,8 +106,8 @@ class CoreChromaticAlphaComplexFactory:
             i: lab for lab, i in self.alpha_complex.input_labels_to_internal_labels_dict.items()
         }
         self.alpha_complex.labels_number = len(self.alpha_complex.input_labels_to_internal_labels_dict)
-        self.alpha_complex.internal_labeling = [self.alpha_complex.input_labels_to_internal_labels_dict[lab]
-                                                for lab in labels]
+        self.alpha_complex.internal_labeling = np.array([self.alpha_complex.input_labels_to_internal_labels_dict[lab]
+                                                         for lab in labels], dtype=int)
 
     def build_alpha_complex_structure(self, lift_perturbation: float, make_co_boundary: bool = True) -> None:
         """
@@ -72,6 +122,15 @@ class CoreChromaticAlphaComplexFactory:
         TimingUtils().start("AlphFac :: Build Alpha Complex Structure")
 
         colorful_max_simplices = self.compute_chromatic_delaunay(lift_perturbation)
+        self.alpha_complex.metrics.record("AlphFac :: Colorful Maximal Simplices", len(colorful_max_simplices))
+        if self.max_radius is not None:
+            colorful_max_simplices = self.prune_above_max_radius(colorful_max_simplices)
+        if self.max_homology_dim is not None:
+            colorful_max_simplices = self.skeleton_of_max_homology_dim(colorful_max_simplices)
+        if self.incremental:
+            self.maximal_simplices = set(colorful_max_simplices)
+            self.maximal_simplices_of_vertex = {}
+            self.update_maximal_simplices_of_vertex(removed=set(), added=self.maximal_simplices)
         TimingUtils().start("AlphFac :: Build Chro Del From Max Simplices")
         self.alpha_complex.simplicial_complex = CoreSimplicialComplexFactory().create_instance(colorful_max_simplices)
         TimingUtils().stop("AlphFac :: Build Chro Del From Max Simplices")
@@ -93,21 +152,253 @@ class CoreChromaticAlphaComplexFactory:
         -------
         List of maximal simplices of the chromatic Delaunay complex.
         """
+        if self.chromatic_pattern is not None:
+            return self.compute_chromatic_delaunay_of_pattern(lift_perturbation)
+        if self.tiles is not None:
+            return self.compute_chromatic_delaunay_tiled(lift_perturbation)
         TimingUtils().start("AlphFac :: Compute Chromatic Delaunay")
 
-        simplices = Delaunay(self.chromatic_lift(lift_perturbation)).simplices
+        if self.delaunay_simplices is not None:
+            simplices = np.array(self.delaunay_simplices, dtype=int)
+        elif self.incremental:
+            self.delaunay = Delaunay(self.chromatic_lift(lift_perturbation), incremental=True,
+                                     qhull_options=self.qhull_options)
+            simplices = self.delaunay.simplices
+        else:
+            simplices = self.delaunay_of_lift(self.chromatic_lift(lift_perturbation))
         colorful_maximal_simplices = self.filter_colorful_simplices(simplices)
 
         TimingUtils().stop("AlphFac :: Compute Chromatic Delaunay")
 
         return [tuple(sorted(int(v) for v in simplex)) for simplex in colorful_maximal_simplices]
 
+    def compute_chromatic_delaunay_of_pattern(self, lift_perturbation: float) -> list[tuple[int, ...]]:
+        """
+        Compute the maximal simplices of the chromatic Delaunay complex whose labels are contained in one of the sets
+        of labels of `self.chromatic_pattern`. The simplices with labels in a set A are exactly the chromatic Delaunay
+        complex of the points labeled by A, so it is computed separately for each maximal set, in the lift with
+        only len(A) - 1 extra dimensions.
+        """
+        TimingUtils().start("AlphFac :: Compute Chromatic Delaunay Of Pattern")
+        internal_labeling = self.alpha_complex.internal_labeling
+        maximal_simplices = []
+        for label_set in self.get_maximal_label_sets():
+            indices = np.flatnonzero(np.isin(internal_labeling, sorted(label_set)))
+            factory = CoreChromaticAlphaComplexFactory(self.alpha_complex.points[indices], internal_labeling[indices],
+                                                       tiles=self.tiles, n_jobs=self.n_jobs,
+                                                       qhull_options=self.qhull_options,
+                                                       delaunay_backend=self.delaunay_backend)
+            factory.alpha_complex = CoreChromaticAlphaComplex()
+            factory.init_points(factory.points, point_perturbation=None)  # the points are already perturbed
+            factory.init_labels(factory.labels)
+            maximal_simplices += [tuple(int(indices[v]) for v in simplex)
+                                  for simplex in factory.compute_chromatic_delaunay(lift_perturbation)]
+        TimingUtils().stop("AlphFac :: Compute Chromatic Delaunay Of Pattern")
+        return maximal_simplices
+
+    def get_maximal_label_sets(self) -> list[set]:
+        """Return the inclusion-maximal sets of the chromatic pattern, as sets of internal labels."""
+        pattern = ChromaticComplexUtils.read_pattern_input(
+            self.chromatic_pattern, set(self.alpha_complex.input_labels_to_internal_labels_dict))
+        pattern = ChromaticComplexUtils.pattern_translate(pattern, self.alpha_complex.input_labels_to_internal_labels_dict)
+        maximal_label_sets = []
+        for label_set in sorted(pattern, key=len, reverse=True):
+            if len(label_set) > 0 and not any(label_set <= other for other in maximal_label_sets):
+                maximal_label_sets.append(label_set)
+        return maximal_label_sets
+
+    def compute_chromatic_delaunay_tiled(self, lift_perturbation: float) -> list[tuple[int, ...]]:
+        """
+        Compute the same maximal simplices as `compute_chromatic_delaunay` by splitting the bounding box of the points
+        into a grid of `self.tiles` tiles, computed in `self.n_jobs` processes. Each tile computes the Delaunay complex
+        of the (globally) lifted points in the tile extended by a halo, and keeps the colorful simplices whose minimal
+        vertex lies in the tile. The initial halo and the points added to all tiles are given by `tile_seeds_and_halo`.
+        The region of a tile is enlarged until the verification in `_chromatic_delaunay_of_tile` guarantees that the
+        stars of all its vertices are those of the whole complex.
+        """
+        TimingUtils().start("AlphFac :: Compute Chromatic Delaunay Tiled")
+        dim = self.alpha_complex.points_dimension
+        lifted_points = self.chromatic_lift(lift_perturbation)
+        bounding_box = np.stack((self.alpha_complex.points.min(axis=0), self.alpha_complex.points.max(axis=0)), axis=1)
+        tiles_number = np.broadcast_to(np.array(self.tiles, dtype=int), (dim,))
+        edges = [np.linspace(lower, upper, count + 1) for (lower, upper), count in zip(bounding_box, tiles_number)]
+        tile_of_point = np.ravel_multi_index(
+            [np.searchsorted(edges[axis][1:-1], self.alpha_complex.points[:, axis], side='right')
+             for axis in range(dim)], tiles_number)
+        tiles = list(itertools.product(*[range(count) for count in tiles_number]))
+        tile_bounds = [np.array([edges[axis][i: i + 2] for axis, i in enumerate(tile)]) for tile in tiles]
+        seed_points, halo = self.tile_seeds_and_halo(lifted_points, bounding_box[:, 1] - bounding_box[:, 0])
+
+        tile_data = (lifted_points, self.alpha_complex.internal_labeling, tile_of_point, seed_points, dim,
+                     self.alpha_complex.labels_number, bounding_box, self.qhull_options)
+        tile_indices = [int(np.ravel_multi_index(tile, tiles_number)) for tile in tiles]
+        if self.n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_tile_data,
+                                     initargs=(*tile_data, Profiler().enabled, Profiler().trace,
+                                               Profiler().memory)) as executor:
+                results = list(executor.map(_profiled_chromatic_delaunay_of_tile, tile_indices, tile_bounds,
+                                            itertools.repeat(halo)))
+            simplices = [tile_simplices for tile_simplices, _ in results]
+            for _, profile in results:
+                if profile is not None:
+                    Profiler().merge_snapshot(profile)
+        else:
+            _init_tile_data(*tile_data)
+            simplices = list(map(_chromatic_delaunay_of_tile, tile_indices, tile_bounds, itertools.repeat(halo)))
+            _TILE_DATA.clear()
+        simplices = np.sort(np.concatenate(simplices), axis=1)
+
+        TimingUtils().stop("AlphFac :: Compute Chromatic Delaunay Tiled")
+        return list(map(tuple, simplices.tolist()))
+
+    def delaunay_of_lift(self, lifted_points: npt.NDArray) -> npt.NDArray:
+        """Return the array of maximal simplices of the Delaunay triangulation of the lifted points, computed by
+        `self.delaunay_backend` if given, and by Qhull otherwise."""
+        if self.delaunay_backend is not None:
+            return np.asarray(self.delaunay_backend(lifted_points), dtype=int)
+        return Delaunay(lifted_points, qhull_options=self.qhull_options).simplices
+
+    def hull_points_mask(self) -> npt.NDArray:
+        """Return the boolean mask of the points on the boundary of the convex hull of the points of their label.
+        Up to the lift perturbation, they include the vertices of the convex hull of the chromatic lift, since
+        the points of each label lie in its face."""
+        hull_points = np.zeros(len(self.alpha_complex.points), dtype=bool)
+        internal_labeling = self.alpha_complex.internal_labeling
+        for label in range(self.alpha_complex.labels_number):
+            label_indices = np.flatnonzero(internal_labeling == label)
+            try:
+                hull = ConvexHull(self.alpha_complex.points[label_indices], qhull_options='Qc')
+                hull_points[label_indices[hull.vertices]] = True
+                hull_points[label_indices[hull.coplanar[:, 0]]] = True
+            except QhullError:  # too few points or all in a hyperplane
+                hull_points[label_indices] = True
+        return hull_points
+
+    def tile_seeds_and_halo(self, lifted_points: npt.NDArray, extents: npt.NDArray) -> tuple[npt.NDArray, float]:
+        """Return the mask of the points added to the regions of all tiles and the initial halo of the tiles for
+        `compute_chromatic_delaunay_tiled`, chosen such that the first Delaunay complex of a tile usually passes the
+        verification in `_chromatic_delaunay_of_tile`.
+
+        Both are read off the Delaunay complex of the band of the points closer than `initial_halo` to the boundary of
+        the convex hull of their label. Its colorful simplices whose slices (see `circumsphere_slices`) lie in the band
+        are simplices of the whole complex, and the halo is twice their largest slice radius, so that it contains the
+        slices of the stars of the vertices in a tile. Along the boundary of the convex hull of all points, the
+        simplices can span long edges of the convex hulls of the labels. The vertices of the simplices with the center
+        outside the convex hull and longer than the halo along an axis are added to the regions, together with the
+        points on the convex hulls of the labels (see `hull_points_mask`)."""
+        TimingUtils().start("AlphFac :: Tile Seeds And Halo")
+        points, internal_labeling = self.alpha_complex.points, self.alpha_complex.internal_labeling
+        dim, labels_number = self.alpha_complex.points_dimension, self.alpha_complex.labels_number
+        seed_points, halo = self.hull_points_mask(), self.initial_halo(extents)
+        try:
+            label_hulls = [ConvexHull(points[internal_labeling == label]).equations for label in range(labels_number)]
+            hull = ConvexHull(points[seed_points]).equations
+        except QhullError:  # too few points or all in a hyperplane
+            TimingUtils().stop("AlphFac :: Tile Seeds And Halo")
+            return seed_points, halo
+
+        depths = np.empty(len(points))
+        for label, equations in enumerate(label_hulls):
+            depths[internal_labeling == label] = _depths_in_hull(points[internal_labeling == label], equations)
+        band_width = halo
+        band = np.flatnonzero(depths <= band_width)
+        try:
+            simplices = band[Delaunay(lifted_points[band], qhull_options=self.qhull_options).simplices]
+        except QhullError:
+            TimingUtils().stop("AlphFac :: Tile Seeds And Halo")
+            return seed_points, halo
+        simplices = simplices[_colorful(internal_labeling[simplices], labels_number)]
+        centers, _, slice_rad = self.circumsphere_slices(lifted_points, simplices, dim, labels_number)
+        center_depths = np.stack([_depths_in_hull(centers[:, :dim], equations) for equations in label_hulls], axis=1)
+        in_band = ((center_depths >= 0) & (center_depths + slice_rad[:, np.newaxis] <= band_width)).all(axis=1)
+        if in_band.any():
+            halo = 2 * slice_rad[in_band].max()
+        long = ((_depths_in_hull(centers[:, :dim], hull) < 0)
+                & (np.ptp(points[simplices], axis=1).max(axis=1) > halo))
+        seed_points[simplices[long].ravel()] = True
+        TimingUtils().stop("AlphFac :: Tile Seeds And Halo")
+        return seed_points, halo
+
+    def initial_halo(self, extents: npt.NDArray) -> float:
+        """Return the first guess of the width of the regions added around a frame with the given extents:
+        twice the typical spacing of points of the least frequent label."""
+        _, counts = np.unique(np.array([str(lab) for lab in self.labels]), return_counts=True)
+        spacing = (np.prod(extents) / counts.min()) ** (1 / len(extents))
+        return 2 * spacing if spacing > 0 else max(extents.max(), 1)
+
+    @staticmethod
+    def circumsphere_slices(lifted_points: npt.NDArray, simplices: npt.NDArray,
+                            points_dimension: int, labels_number: int) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+        """For each of the given simplices of the chromatic lift, return the center and squared radius of its
+        circumsphere, and the largest radius of its slices at the heights of all labels. The slices are balls
+        centered at the first `points_dimension` coordinates of the center, and contain the points of any label
+        in the circumsphere."""
+        centers, rad2 = GeometryUtils.circumspheres_of_simplices(lifted_points[simplices])
+        label_heights = np.eye(labels_number, labels_number - 1, k=-1)
+        slice_rad2 = rad2[:, np.newaxis] - np.square(centers[:, np.newaxis, points_dimension:] - label_heights).sum(axis=2)
+        return centers, rad2, np.sqrt(np.maximum(slice_rad2.max(axis=1), 0))
+
+    def prune_above_max_radius(self, max_simplices: list[tuple[int, ...]]) -> list[tuple[int, ...]]:
+        """
+        Replace every maximal simplex whose radius is provably larger than `self.max_radius` by its largest faces
+        whose radius may not be (recursively), see `radius_lower_bounds`.
+
+        The radii up to `max_radius` stay the same: if the smallest circumstack of a kept face tau has radius
+        at most `max_radius` and contains a vertex w of a dropped coface, then the lower bound of tau + w is at most
+        the radius of the stack, so tau + w is kept and w is still found by the emptiness check of tau.
+        """
+        TimingUtils().start("AlphFac :: Prune Above Max Radius")
+        kept = []
+        simplices = np.array(max_simplices, dtype=int).reshape(len(max_simplices), -1)
+        while len(simplices) > 0 and simplices.shape[1] > 1:
+            below = self.radius_lower_bounds(simplices) <= self.max_radius
+            kept += [tuple(int(v) for v in simplex) for simplex in simplices[below]]
+            dropped = simplices[~below]
+            faces = [np.delete(dropped, i, axis=1) for i in range(dropped.shape[1])]
+            simplices = np.unique(np.concatenate(faces), axis=0)
+        kept += [(int(v),) for v in range(len(self.alpha_complex.points))]  # all vertices have radius 0
+        TimingUtils().stop("AlphFac :: Prune Above Max Radius")
+        return kept
+
+    def skeleton_of_max_homology_dim(self, max_simplices: list[tuple[int, ...]]) -> list[tuple[int, ...]]:
+        """Return the maximal simplices of the skeleton of dimension `self.max_homology_dim` + 1, which is enough for
+        the homology up to `max_homology_dim`. The maximal simplices of the whole complex are kept for the radius
+        function, which depends on the simplices above the skeleton."""
+        TimingUtils().start("AlphFac :: Skeleton Of Max Homology Dim")
+        self.maximal_simplices = max_simplices
+        size = self.max_homology_dim + 2
+        skeleton = list({face for simplex in max_simplices
+                         for face in (itertools.combinations(simplex, size) if len(simplex) > size else [simplex])})
+        TimingUtils().stop("AlphFac :: Skeleton Of Max Homology Dim")
+        return skeleton
+
+    def radius_lower_bounds(self, simplices: npt.NDArray) -> npt.NDArray:
+        """Return a lower bound on the radius of each of the given simplices (array of vertex indices of equal
+        length): half of the largest distance of two of its vertices with the same label. The spheres of a stack
+        through the simplex contain the vertices of their label, so this is at most the radius of any circumstack."""
+        points = self.alpha_complex.points[simplices]
+        labels = self.alpha_complex.internal_labeling[simplices]
+        sq_distances = np.square(points[:, :, np.newaxis, :] - points[:, np.newaxis, :, :]).sum(axis=3)
+        same_label = labels[:, :, np.newaxis] == labels[:, np.newaxis, :]
+        return np.sqrt(np.where(same_label, sq_distances, 0).max(axis=(1, 2))) / 2
+
+    def restrict_to_max_radius(self) -> None:
+        """Restrict the alpha complex with computed radius function to the simplices with radius at most
+        `self.max_radius`. The radius function is monotone, so these form a sub-complex."""
+        if self.max_radius is None:
+            return
+        self.alpha_complex.simplicial_complex = CoreSimplicialComplexFactory().create_instance(
+            {simplex: weight for simplex, weight in self.alpha_complex.simplicial_complex.simplex_weights.items()
+             if weight <= self.max_radius})
+
     def filter_colorful_simplices(self, simplices):
-        """Generator. Given labels and simplices, yields only those simplices that span all colors."""
-        all_labels = set(self.alpha_complex.internal_labeling)
-        for simplex in simplices:
-            if set(self.alpha_complex.internal_labeling[i] for i in simplex) == all_labels:
-                yield simplex
+        """Generator. Given labels and simplices (as a 2D array), yields only those simplices that span all colors."""
+        simplices = np.asarray(simplices, dtype=int)
+        if len(simplices) == 0:
+            return
+        simplex_labels = np.sort(self.alpha_complex.internal_labeling[simplices], axis=1)
+        numbers_of_labels = 1 + (np.diff(simplex_labels, axis=1) != 0).sum(axis=1)
+        yield from simplices[numbers_of_labels == len(np.unique(self.alpha_complex.internal_labeling))]
 
     @staticmethod
     def perturb_points(points, point_perturbation):
@@ -118,9 +409,13 @@ class CoreChromaticAlphaComplexFactory:
         Add extra coordinates to lift points to the chromatic simplex. Here we choose one-hot embedding without
         the first coordinate. That is, 0 --> (0,0,0,...), 1 --> (1,0,0,...), 2 --> (0,1,0,...), etc.
         """
+        return self.lift_points(self.alpha_complex.points, self.alpha_complex.internal_labeling, lift_perturbation)
+
+    def lift_points(self, points, internal_labeling, lift_perturbation) -> npt.NDArray:
+        """Return the chromatic lift of the given points with given internal labels, see `chromatic_lift`."""
         pts_lift: npt.NDArray = np.array([
             np.concatenate((point, [1 if i == label else 0 for i in range(1, self.alpha_complex.labels_number)]))
-            for point, label in zip(self.alpha_complex.points, self.alpha_complex.internal_labeling)])
+            for point, label in zip(points, internal_labeling)])
         if lift_perturbation:
             prefix = [0] * self.alpha_complex.points_dimension
             for pt in pts_lift:
@@ -128,12 +423,106 @@ class CoreChromaticAlphaComplexFactory:
 
         return pts_lift
 
+    def add_points(self, points, labels) -> CoreChromaticAlphaComplex:
+        """
+        Add labeled points to the chromatic alpha complex created by `create_instance` in the incremental mode.
+        The points are inserted into the Delaunay triangulation of the chromatic lift, and the radius function is only
+        computed again for the simplices whose star changed, as the radius of a simplex (and the weights of its cofaces)
+        only depends on its star.
+        The persistence of the complex is cleared.
+        """
+        if self.delaunay is None:
+            raise ValueError("Points can only be added to a complex created with incremental=True.")
+        points = np.array(points, dtype='d').reshape(-1, self.alpha_complex.points_dimension)
+        if len(points) != len(labels):
+            raise ValueError("The length of points has to equal the length of labels.")
+        unknown_labels = set(labels) - set(self.alpha_complex.input_labels_to_internal_labels_dict)
+        if unknown_labels:
+            raise ValueError(f"Cannot add points with new labels {unknown_labels}, the chromatic lift depends on the "
+                             f"set of labels.")
+        TimingUtils().start("AlphFac :: Add Points")
+        if self.instance_parameters['point_perturbation']:
+            points = np.array(self.perturb_points(points, self.instance_parameters['point_perturbation']))
+        internal_labeling = np.array([self.alpha_complex.input_labels_to_internal_labels_dict[lab] for lab in labels],
+                                     dtype=int)
+        self.points = np.concatenate((self.points, points))
+        self.labels = list(self.labels) + list(labels)
+        self.alpha_complex.points = np.concatenate((self.alpha_complex.points, points))
+        self.alpha_complex.internal_labeling = np.concatenate((self.alpha_complex.internal_labeling, internal_labeling))
+
+        self.delaunay.add_points(
+            self.lift_points(points, internal_labeling, self.instance_parameters['lift_perturbation']))
+        maximal_simplices = {tuple(sorted(int(v) for v in simplex))
+                             for simplex in self.filter_colorful_simplices(self.delaunay.simplices)}
+        removed, added = self.maximal_simplices - maximal_simplices, maximal_simplices - self.maximal_simplices
+        self.maximal_simplices = maximal_simplices
+        self.update_maximal_simplices_of_vertex(removed=removed, added=added)
+        changed_simplices = self.update_alpha_complex_structure(removed=removed, added=added)
+
+        simplicial_complex = self.alpha_complex.simplicial_complex
+        sq_radius_function = RadiusFunctionConstructor.construct_sq_radius_function(
+            self.alpha_complex, use_morse_optimization=self.instance_parameters['use_morse_optimization'],
+            known_sq_radii={simplex: weight ** 2 for simplex, weight in simplicial_complex.simplex_weights.items()
+                            if simplex not in changed_simplices})
+        simplicial_complex.update_simplex_weights({simplex: np.sqrt(sq_radius_function[simplex])
+                                                   for simplex in changed_simplices})
+        simplicial_complex.persistence_data = {}
+        simplicial_complex.birth_death = {}
+        self.alpha_complex.metrics.add("AlphFac :: Changed Simplices", len(changed_simplices))
+        self.record_complex_metrics()
+        TimingUtils().stop("AlphFac :: Add Points")
+        return self.alpha_complex
+
+    def update_maximal_simplices_of_vertex(self, removed: set[tuple[int, ...]], added: set[tuple[int, ...]]) -> None:
+        for simplex in removed:
+            for v in simplex:
+                self.maximal_simplices_of_vertex[v].discard(simplex)
+        for simplex in added:
+            for v in simplex:
+                self.maximal_simplices_of_vertex.setdefault(v, set()).add(simplex)
+
+    def update_alpha_complex_structure(self, removed: set[tuple[int, ...]], added: set[tuple[int, ...]]) -> set:
+        """Update the simplicial complex (without the weights) after replacing the `removed` maximal simplices by the
+        `added` ones. Return the simplices of the updated complex whose star changed, i.e., the faces of the removed
+        or added maximal simplices."""
+        TimingUtils().start("AlphFac :: Update Alpha Complex Structure")
+        simplicial_complex = self.alpha_complex.simplicial_complex
+        faces_of_removed, faces_of_added = [{face for simplex in simplices for k in range(1, len(simplex) + 1)
+                                             for face in itertools.combinations(simplex, k)}
+                                            for simplices in (removed, added)]
+
+        obsolete_simplices = [simplex for simplex in faces_of_removed - faces_of_added
+                              if simplex in simplicial_complex.boundary and not self.is_in_maximal_simplex(simplex)]
+        for simplex in sorted(obsolete_simplices, key=len, reverse=True):
+            simplicial_complex.dim_simplex_dict[len(simplex) - 1].discard(simplex)
+            for face in simplicial_complex.boundary.pop(simplex):
+                simplicial_complex.co_boundary[face].discard(simplex)
+            simplicial_complex.co_boundary.pop(simplex)
+            simplicial_complex.simplex_weights.pop(simplex, None)
+        new_simplices = [simplex for simplex in faces_of_added if simplex not in simplicial_complex.boundary]
+        for simplex in sorted(new_simplices, key=len):
+            simplicial_complex.dim_simplex_dict.setdefault(len(simplex) - 1, set()).add(simplex)
+            simplicial_complex.boundary[simplex] = set(itertools.combinations(simplex, len(simplex) - 1)) - {()}
+            simplicial_complex.co_boundary[simplex] = set()
+            for face in simplicial_complex.boundary[simplex]:
+                simplicial_complex.co_boundary[face].add(simplex)
+        simplicial_complex.clear_empty_dimensions()
+        simplicial_complex.dimension = max(simplicial_complex.dim_simplex_dict, default=-1)
+
+        TimingUtils().stop("AlphFac :: Update Alpha Complex Structure")
+        return {simplex for simplex in faces_of_removed | faces_of_added if simplex in simplicial_complex.boundary}
+
+    def is_in_maximal_simplex(self, simplex: tuple[int, ...]) -> bool:
+        vertex = min(simplex, key=lambda v: len(self.maximal_simplices_of_vertex.get(v, ())))
+        return any(set(simplex) <= set(max_simplex) for max_simplex in self.maximal_simplices_of_vertex.get(vertex, ()))
+
     def add_radius_function(self, use_morse_optimization: bool, legacy_radius_function: bool):
         if legacy_radius_function:
             LegacyRadiusFunctionUtils().compute_radius_function(self.alpha_complex)
         else:
             sq_radius_function = RadiusFunctionConstructor.construct_sq_radius_function(
-                self.alpha_complex, use_morse_optimization=use_morse_optimization)
+                self.alpha_complex, use_morse_optimization=use_morse_optimization,
+                maximal_simplices=self.maximal_simplices)
             self.alpha_complex.simplicial_complex.set_simplex_weights(
                 {simplex: np.sqrt(rad2) for simplex, rad2 in sq_radius_function.items()})
 
@@ -142,23 +531,22 @@ class CoreChromaticAlphaComplexFactory:
             raise ValueError("The length of points has to equal the length of labels.")
 
 
-class CoreChromaticAlphaComplexTorus2DFactory(CoreChromaticAlphaComplexFactory):
+class CoreChromaticAlphaComplexTorusFactory(CoreChromaticAlphaComplexFactory):
 
-    def __init__(self, points, labels, xrange=None, yrange=None,
-                 suppress_wrapping_check=False, suppress_boundary_consistency_check=False):
-        super().__init__(points, labels)
-        if self.points.shape[1] != 2:
-            raise ValueError(f"ChromaticAlphaComplexTorus2D expects 2-dimensional"
-                             f" point sets ({self.alpha_complex.points_dimension}-dimensional given).")
-        if xrange is None or yrange is None:
-            raise TypeError("ChromaticAlphaComplexTorus2D missing required argument xrange or yrange")
-        self.check_frame(xrange, yrange)
-        self.xrange = np.array(xrange)
-        self.yrange = np.array(yrange)
+    def __init__(self, points, labels, ranges=None,
+                 suppress_wrapping_check=False, suppress_boundary_consistency_check=False, max_radius=None,
+                 qhull_options=None, delaunay_backend=None):
+        super().__init__(points, labels, max_radius=max_radius, qhull_options=qhull_options,
+                         delaunay_backend=delaunay_backend)
+        if ranges is None:
+            raise TypeError("ChromaticAlphaComplexTorus missing required argument ranges")
+        self.ranges = np.array(ranges, dtype='d')  # ranges[axis] = (lower, upper) bound of the frame along axis
+        self.check_frame(self.ranges)
         self.suppress_wrapping_check = suppress_wrapping_check
         self.suppress_boundary_consistency_check = suppress_boundary_consistency_check
-        self.xshift, self.yshift = self.get_shifts()
         self.n = len(points)
+        self.periods = self.ranges[:, 1] - self.ranges[:, 0]
+        self.preimage = np.arange(self.n)  # preimage[v] is the index of the original point of which v is a copy
 
     def create_instance(self, lift_perturbation: Optional[float],
                         point_perturbation: Optional[float],
@@ -170,55 +558,97 @@ class CoreChromaticAlphaComplexTorus2DFactory(CoreChromaticAlphaComplexFactory):
         TimingUtils().start("AlphFac :: Create Alf Instance Torus")
         self.alpha_complex = CoreChromaticAlphaComplex()
 
-        self.init_points_torus(self.points, point_perturbation=None)
-        self.init_labels(list(self.labels) * 9)
         self.build_alpha_complex_structure_torus(lift_perturbation=lift_perturbation)
-        self.add_radius_function(use_morse_optimization=use_morse_optimization,
-                                 legacy_radius_function=legacy_radius_function)
-        self.restrict_to_torus_simplices()
+        if legacy_radius_function:
+            self.add_radius_function(use_morse_optimization=use_morse_optimization, legacy_radius_function=True)
+            self.restrict_to_torus_simplices()
+        else:
+            self.add_radius_function_torus(use_morse_optimization=use_morse_optimization)
+        self.restrict_to_max_radius()
+        self.record_complex_metrics()
 
-        TimingUtils().start("AlphFac :: Create Alf Instance Torus")
+        TimingUtils().stop("AlphFac :: Create Alf Instance Torus")
 
         return self.alpha_complex
 
-    def check_frame(self, xrange: npt.NDArray, yrange: npt.NDArray):
+    def check_frame(self, ranges: npt.NDArray):
         """Check whether the points fit into the frame."""
-        if (xrange[0] >= xrange[1]) or (yrange[0] >= yrange[1]):
-            raise ValueError("xrange and yrange need to be non-trivial intervals (a, b) with a < b.")
-        if ((xrange[0] <= self.points[:, 0]) * (self.points[:, 0] <= xrange[1])
-                * (yrange[0] <= self.points[:, 1]) * (self.points[:, 1] <= yrange[1])).all():
+        if ranges.ndim != 2 or ranges.shape[1] != 2 or (self.points.ndim == 2 and len(ranges) != self.points.shape[1]):
+            raise ValueError("ranges need to be given as one interval (a, b) for each coordinate of the points.")
+        if (ranges[:, 0] >= ranges[:, 1]).any():
+            raise ValueError("ranges need to be non-trivial intervals (a, b) with a < b.")
+        if ((ranges[:, 0] <= self.points) & (self.points <= ranges[:, 1])).all():
             return True
         else:
-            raise ValueError("The points do not fit into the given (xrange, yrange) frame.")
-
-    def get_shifts(self):
-        """Return the shifting constants"""
-        return self.xrange[1] - self.xrange[0], self.yrange[1] - self.yrange[0]
-
-    def get_3x3grid(self, points):
-        return np.concatenate((
-            points,
-            points + [0, self.yshift],
-            points + [self.xshift, self.yshift],
-            points + [self.xshift, 0],
-            points + [self.xshift, - self.yshift],
-            points + [0, - self.yshift],
-            points + [- self.xshift, - self.yshift],
-            points + [- self.xshift, 0],
-            points + [- self.xshift, self.yshift],
-        ))
-
-    def init_points_torus(self, points, point_perturbation: Optional[float]) -> None:
+            raise ValueError("The points do not fit into the given frame.")
+
+    def get_periodic_images(self, points, margin: float) -> tuple[npt.NDArray, npt.NDArray]:
+        """Return the points together with those of their periodic copies (shifted by -1, 0 or 1 period along each
+        axis) that lie within `margin` from the frame, and the array of preimages, i.e., indices of the original
+        points of all returned points. The original points come first. If `margin` is at least the largest period,
+        this gives all copies of the 3^d grid."""
+        images, preimages = [points], [np.arange(len(points))]
+        for shift in itertools.product((0, 1, -1), repeat=len(self.periods)):
+            if not any(shift):
+                continue
+            inside = np.ones(len(points), dtype=bool)
+            for axis, direction in enumerate(shift):
+                if direction == 1:  # the copy is shifted above the frame, so the point needs to be close to bottom
+                    inside &= points[:, axis] <= self.ranges[axis, 0] + margin
+                elif direction == -1:
+                    inside &= points[:, axis] >= self.ranges[axis, 1] - margin
+            images.append(points[inside] + np.array(shift) * self.periods)
+            preimages.append(np.flatnonzero(inside))
+        return np.concatenate(images), np.concatenate(preimages)
+
+    def initial_margin(self) -> float:
+        """Return the first guess of the width of the strips of periodic images: twice the typical spacing of points
+        of the least frequent label."""
+        return self.initial_halo(self.periods)
+
+    def init_points_torus(self, points, margin: float, point_perturbation: Optional[float] = None) -> None:
         if point_perturbation:
             points = np.array(self.perturb_points(points, point_perturbation))
         else:
             points = np.array(points)
-        self.alpha_complex.points = self.get_3x3grid(points)
-        self.alpha_complex.points_dimension = 2
+        self.alpha_complex.points, self.preimage = self.get_periodic_images(points, margin)
+        self.alpha_complex.points_dimension = len(self.periods)
+        self.init_labels([self.labels[i] for i in self.preimage])
+
+    def compute_chromatic_delaunay_torus(self, lift_perturbation: float) -> list[tuple[int, ...]]:
+        """Compute the maximal simplices of the chromatic Delaunay complex with at least one vertex in the frame.
+        Only periodic images within a margin from the frame are used. The margin is doubled until the empty
+        circumspheres of all such simplices fit into the region covered by the images, at which point they are
+        guaranteed to be simplices of the periodic complex. When the margin reaches the largest period, all images
+        of the 3^d grid are used and no further check is done."""
+        TimingUtils().start("AlphFac :: Compute Chromatic Delaunay Torus")
+        margin = self.initial_margin()
+        while True:
+            margin = min(margin, self.periods.max())
+            self.init_points_torus(self.points, margin)
+            lifted_points = self.chromatic_lift(lift_perturbation)
+            simplices = self.delaunay_of_lift(lifted_points)
+            simplices = np.array([simplex for simplex in self.filter_colorful_simplices(simplices)], dtype=int)
+            simplices = self.purge_outer_simplices(simplices)
+            if margin >= self.periods.max() or self.check_simplices_inside_images(lifted_points, simplices, margin):
+                break
+            margin *= 2
+        TimingUtils().stop("AlphFac :: Compute Chromatic Delaunay Torus")
+        return [tuple(sorted(int(v) for v in simplex)) for simplex in simplices]
+
+    def check_simplices_inside_images(self, lifted_points: npt.NDArray, simplices: npt.NDArray, margin: float) -> bool:
+        """Return True if, for each of the given simplices of the lifted points, the slices of its circumsphere at the
+        heights of all labels lie in the frame extended by `margin`, where all the periodic images are present."""
+        if len(simplices) == 0:
+            return True
+        dim = self.alpha_complex.points_dimension
+        centers, _, slice_rad = self.circumsphere_slices(lifted_points, simplices, dim, self.alpha_complex.labels_number)
+        lower_ok = centers[:, :dim] - slice_rad[:, np.newaxis] >= self.ranges[:, 0] - margin
+        upper_ok = centers[:, :dim] + slice_rad[:, np.newaxis] <= self.ranges[:, 1] + margin
+        return bool((lower_ok & upper_ok).all())
 
     def build_alpha_complex_structure_torus(self, lift_perturbation: float, make_co_boundary: bool = True) -> None:
-        colorful_max_simplices = self.compute_chromatic_delaunay(lift_perturbation)
-        colorful_max_simplices = self.purge_outer_simplices(colorful_max_simplices)
+        colorful_max_simplices = self.compute_chromatic_delaunay_torus(lift_perturbation)
 
         if not self.suppress_boundary_consistency_check:
             if not self.check_fibers_of_maximal_simplices(colorful_max_simplices):
@@ -230,41 +660,64 @@ class CoreChromaticAlphaComplexTorus2DFactory(CoreChromaticAlphaComplexFactory):
             self.alpha_complex.simplicial_complex.co_boundary = BoundaryMatrixUtils.make_co_boundary(
                 self.alpha_complex.simplicial_complex.boundary)
 
-    def purge_outer_simplices(self, simplices):
-        """Return list of only those simplices that have at least one vertex in the inner square of the 3x3 grid.
-        The check is done by vertex index: a vertex is in the inner region iff its index is less than the length of
+    def purge_outer_simplices(self, simplices: npt.NDArray) -> npt.NDArray:
+        """Return array of only those simplices that have at least one vertex in the frame.
+        The check is done by vertex index: a vertex is in the frame iff its index is less than the length of
         the original given point set."""
-        return [simplex for simplex in simplices if any(v < self.n for v in simplex)]
+        return simplices[(simplices < self.n).any(axis=1)]
+
+    def add_radius_function_torus(self, use_morse_optimization: bool):
+        """Compute the radius function only on the representatives of torus simplices (their cofaces are only used
+        for the emptiness checks), and replace the complex by the complex on the torus with this radius function."""
+        torus_simplex_of, representatives = self.compute_torus_simplices(
+            self.alpha_complex.simplicial_complex.dim_simplex_dict)
+        sq_radius_function = RadiusFunctionConstructor.construct_sq_radius_function(
+            self.alpha_complex, use_morse_optimization=use_morse_optimization,
+            simplex_filter=representatives.__contains__, simplex_key=torus_simplex_of.__getitem__)
+        self.alpha_complex.simplicial_complex = CoreSimplicialComplexFactory().create_instance(
+            {simplex: np.sqrt(rad2) for simplex, rad2 in sq_radius_function.items()})
 
     def restrict_to_torus_simplices(self):
         """Restricts the alpha_complex with computed radius function to just the torus simplices."""
-        torus_simplices_transform = {simplex: self.transform_simplex_to_torus(simplex)
-                                     for simplex in self.alpha_complex.simplicial_complex.simplex_weights.keys()
-                                     if self.is_torus_simplex(simplex)}
-        if not self.suppress_wrapping_check:  # keyword parameter of the factory
-            if not self.check_unique_preimages(torus_simplices_transform):
-                self._error_wrapping()
+        torus_simplex_of, representatives = self.compute_torus_simplices(
+            self.alpha_complex.simplicial_complex.dim_simplex_dict)
         self.alpha_complex.simplicial_complex = CoreSimplicialComplexFactory().create_instance(
             {
-                simplex_transformed: self.alpha_complex.simplicial_complex.simplex_weights[simplex]
-                for simplex, simplex_transformed in torus_simplices_transform.items()
+                torus_simplex_of[simplex]: self.alpha_complex.simplicial_complex.simplex_weights[simplex]
+                for simplex in representatives
             }
         )
 
-    def is_torus_simplex(self, simplex):
-        """Return True if the given simplex is the single representative of a torus simplex."""
-        if len(simplex) == 1:
-            return simplex[0] < self.n
-        else:
-            return min(simplex) == min([v % self.n for v in simplex])
-
-    def transform_simplex_to_torus(self, simplex):
-        """Given a simplex on 3x3 grid, return the simplex on the torus using only original vertices."""
-        return tuple(sorted(v % self.n for v in simplex))
+    def compute_torus_simplices(self, dim_simplex_dict: dict[int, set]) -> tuple[dict, set]:
+        """Given the simplices on the periodic images by dimension, return the dictionary mapping each of them to its
+        simplex on the torus, and the set of the single representatives of the torus simplices.
+        Raises an error if two representatives wrap to the same torus simplex (unless the check is suppressed)."""
+        torus_simplex_of, representatives = {}, set()
+        for simplices_list in dim_simplex_dict.values():
+            if len(simplices_list) == 0:
+                continue
+            simplices_list = list(simplices_list)
+            torus_simplices, is_representative = self.transform_simplices_to_torus(np.array(simplices_list))
+            torus_simplices_list = list(map(tuple, torus_simplices.tolist()))
+            torus_simplex_of.update(zip(simplices_list, torus_simplices_list))
+            representatives.update(itertools.compress(simplices_list, is_representative))
+            if not self.suppress_wrapping_check:  # keyword parameter of the factory
+                if not self.check_unique_preimages(torus_simplices[is_representative]):
+                    self._error_wrapping()
+        return torus_simplex_of, representatives
+
+    def transform_simplices_to_torus(self, simplices: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
+        """Given an (m, k) array of simplices on the periodic images, return the (m, k) array of the simplices on the
+        torus using only original vertices (sorted in rows), and the boolean mask of the single representatives
+        of the torus simplices, i.e., those whose minimal vertex is the minimal vertex of the torus simplex.
+        (For a vertex this means that it is an original vertex.)"""
+        preimages = self.preimage[simplices]
+        return np.sort(preimages, axis=1), simplices.min(axis=1) == preimages.min(axis=1)
 
     @staticmethod
-    def check_unique_preimages(torus_simplices_transform):
-        return len(set(torus_simplices_transform.keys())) == len(set(torus_simplices_transform.values()))
+    def check_unique_preimages(torus_simplices: npt.NDArray) -> bool:
+        """Return True if the rows of the given (m, k) array of torus simplices are unique."""
+        return len(np.unique(torus_simplices, axis=0)) == len(torus_simplices)
 
     def _error_wrapping(self):
         raise ValueError("Multiple simplices wrap around the torus to became the same simplex. "
@@ -273,25 +726,19 @@ class CoreChromaticAlphaComplexTorus2DFactory(CoreChromaticAlphaComplexFactory):
                          "You can suppress this error by passing suppress_wrapping_check=True "
                          "to ChromaticAlphaComplex.")
 
-    def check_fibers_of_maximal_simplices(self, max_simplices):
+    def check_fibers_of_maximal_simplices(self, max_simplices: npt.NDArray) -> bool:
         """Return True if, in the set of maximal simplices mapped to the same center simplex, each center vertex
         is present exactly once."""
-        fibers = {}
-        for simplex in max_simplices:
-            simplex_center = self.transform_simplex_to_torus(simplex)
-            if simplex_center not in fibers:
-                fibers[simplex_center] = set()
-            fibers[simplex_center].add(simplex)
-
-        for simplex_center, fiber in fibers.items():
-            vertex_counter = [0] * len(simplex_center)
-            for i, v in enumerate(simplex_center):
-                for fiber_simplex in fiber:
-                    if v in fiber_simplex:
-                        vertex_counter[i] += 1
-            if any(count != 1 for count in vertex_counter):
-                return False
-        return True
+        max_simplices = np.asarray(max_simplices)
+        if len(max_simplices) == 0:
+            return True
+        simplices_center = np.sort(self.preimage[max_simplices], axis=1)
+        _, fiber_index = np.unique(simplices_center, axis=0, return_inverse=True)
+        # contains_center_vertex[i, j] == 1 iff the j-th vertex of the center simplex is in the i-th simplex
+        contains_center_vertex = (max_simplices[:, np.newaxis, :] == simplices_center[:, :, np.newaxis]).any(axis=2)
+        vertex_counter = np.zeros((fiber_index.max() + 1, max_simplices.shape[1]), dtype=int)
+        np.add.at(vertex_counter, fiber_index.reshape(-1), contains_center_vertex)
+        return bool((vertex_counter == 1).all())
 
     def _error_boundary_consistency(self):
         raise ValueError("Inconsistency in the Delaunay complex at the boundary of the torus region. "
@@ -299,3 +746,169 @@ class CoreChromaticAlphaComplexTorus2DFactory(CoreChromaticAlphaComplexFactory):
                          "e.g., by passing `point_perturbation=1e-5` argument to the constructor. "
                          "You can suppress this error by passing suppress_boundary_consistency_check=True "
                          "to ChromaticAlphaComplex.")
+
+
+class CoreChromaticAlphaComplexTorus2DFactory(CoreChromaticAlphaComplexTorusFactory):
+
+    def __init__(self, points, labels, xrange=None, yrange=None,
+                 suppress_wrapping_check=False, suppress_boundary_consistency_check=False, max_radius=None,
+                 qhull_options=None, delaunay_backend=None):
+        points_dimension = np.array(points, dtype='d').shape[1] if np.ndim(points) == 2 else 0
+        if points_dimension != 2:
+            raise ValueError(f"ChromaticAlphaComplexTorus2D expects 2-dimensional"
+                             f" point sets ({points_dimension}-dimensional given).")
+        if xrange is None or yrange is None:
+            raise TypeError("ChromaticAlphaComplexTorus2D missing required argument xrange or yrange")
+        super().__init__(points, labels, ranges=[xrange, yrange],
+                         suppress_wrapping_check=suppress_wrapping_check,
+                         suppress_boundary_consistency_check=suppress_boundary_consistency_check,
+                         max_radius=max_radius, qhull_options=qhull_options, delaunay_backend=delaunay_backend)
+        self.xrange, self.yrange = self.ranges
+        self.xshift, self.yshift = self.get_shifts()
+
+    def get_shifts(self):
+        """Return the shifting constants"""
+        return self.xrange[1] - self.xrange[0], self.yrange[1] - self.yrange[0]
+
+
+_TILE_DATA = {}  # data shared by all tiles, set once per process by `_init_tile_data`
+
+
+def _init_tile_data(lifted_points, internal_labeling, tile_of_point, seed_points,
+                    points_dimension, labels_number, bounding_box, qhull_options,
+                    profile: bool = False, trace: bool = False, memory: bool = False):
+    if profile:  # a worker process, profiled from scratch and merged by the parent
+        Profiler().reset()
+        Profiler().enable(trace=trace, memory=memory)
+    _TILE_DATA.update(lifted_points=lifted_points, internal_labeling=internal_labeling, tile_of_point=tile_of_point,
+                      seed_points=seed_points, points_dimension=points_dimension, labels_number=labels_number,
+                      bounding_box=bounding_box, qhull_options=qhull_options,
+                      points_tree=KDTree(lifted_points[:, :points_dimension]))
+
+
+def _profiled_chromatic_delaunay_of_tile(tile_index: int, tile_bounds: npt.NDArray,
+                                         halo: float) -> tuple[npt.NDArray, Optional[dict]]:
+    """Worker of the process pool: return `_chromatic_delaunay_of_tile` together with the profile of the tile
+    (None if profiling is disabled), which is reset for the next tile of the process."""
+    if not Profiler().enabled:
+        return _chromatic_delaunay_of_tile(tile_index, tile_bounds, halo), None
+    simplices = _chromatic_delaunay_of_tile(tile_index, tile_bounds, halo)
+    profile = Profiler().snapshot()
+    Profiler().reset()
+    return simplices, profile
+
+
+@Profiler().profiled("AlphFac :: Chromatic Delaunay Of Tile")
+def _chromatic_delaunay_of_tile(tile_index: int, tile_bounds: npt.NDArray, halo: float) -> npt.NDArray:
+    """Worker for `CoreChromaticAlphaComplexFactory.compute_chromatic_delaunay_tiled`. Return the array of colorful
+    maximal simplices of the chromatic Delaunay complex whose minimal vertex lies in the given tile.
+
+    The Delaunay complex is computed on the points in the tile extended by `halo` together with the seed points of
+    `tile_seeds_and_halo`, which include the points on the convex hulls of the labels (the region). Up to the lift
+    perturbation, the colorful simplices triangulate the convex hull of the chromatic lift (the others are slivers in
+    its faces missing a label), and two colorful simplices sharing a vertex are connected through colorful facets.
+    Hence the colorful stars of the vertices in the tile are the same as in the Delaunay complex of all the points if
+        (1) the circumspheres of their simplices are empty of the points outside the region, and
+        (2) their colorful facets on the boundary of the convex hull of the region have no points outside the region
+            beyond them, i.e., they are also on the boundary of the convex hull of all points.
+    The points violating these conditions are added to the region until there are none (if there are more of them than
+    points in the region, the halo is doubled instead). Sides of the region at the bounding box of all points are
+    unbounded."""
+    lifted_points, labels = _TILE_DATA['lifted_points'], _TILE_DATA['internal_labeling']
+    dim, labels_number = _TILE_DATA['points_dimension'], _TILE_DATA['labels_number']
+    bounding_box = _TILE_DATA['bounding_box']
+    points = lifted_points[:, :dim]
+    in_tile = _TILE_DATA['tile_of_point'] == tile_index
+    if not in_tile.any():
+        return np.empty((0, lifted_points.shape[1] + 1), dtype=int)
+
+    in_region = _TILE_DATA['seed_points'].copy()  # then the convex hull of the region is that of all points
+    enlarge_box = True
+    while True:
+        if enlarge_box:
+            region_lower = np.where(tile_bounds[:, 0] <= bounding_box[:, 0], -np.inf, tile_bounds[:, 0] - halo)
+            region_upper = np.where(tile_bounds[:, 1] >= bounding_box[:, 1], np.inf, tile_bounds[:, 1] + halo)
+            in_region |= ((points >= region_lower) & (points <= region_upper)).all(axis=1)
+            enlarge_box = False
+        region_indices = np.flatnonzero(in_region)
+        try:
+            delaunay = Delaunay(lifted_points[region_indices], qhull_options=_TILE_DATA['qhull_options'])
+        except QhullError:  # too few points or all in a hyperplane
+            if in_region.all():
+                raise
+            halo *= 2
+            enlarge_box = True
+            continue
+        simplices = region_indices[delaunay.simplices]
+        if in_region.all():
+            break
+        violating = _tile_stars_violating_points(simplices, delaunay.neighbors, in_tile, in_region,
+                                                 region_lower, region_upper)
+        if len(violating) == 0:
+            break
+        if len(violating) > len(region_indices):  # the halo is too thin, the region is cut too close to the tile
+            halo *= 2
+            enlarge_box = True
+        else:
+            in_region[violating] = True
+
+    return simplices[_colorful(labels[simplices], labels_number) & in_tile[simplices.min(axis=1)]]
+
+
+def _tile_stars_violating_points(simplices, neighbors, in_tile, in_region, region_lower, region_upper) -> npt.NDArray:
+    """Return the indices of the points outside the region violating the conditions (1) or (2) in
+    `_chromatic_delaunay_of_tile`. The tests are conservative, points on the spheres or hyperplanes (up to rounding)
+    are also returned. Only the spheres with slices not contained in the box of the region need to be tested, since
+    all points in the box are in the region. The candidate points in the slices are found by the k-d tree."""
+    lifted_points, labels = _TILE_DATA['lifted_points'], _TILE_DATA['internal_labeling']
+    dim, labels_number = _TILE_DATA['points_dimension'], _TILE_DATA['labels_number']
+    star = in_tile[simplices].any(axis=1) & _colorful(labels[simplices], labels_number)
+    simplices, neighbors = simplices[star], neighbors[star]
+    violating = []
+
+    centers, rad2, slice_rad = CoreChromaticAlphaComplexFactory.circumsphere_slices(lifted_points, simplices,
+                                                                                    dim, labels_number)
+    exceeding = ~((centers[:, :dim] - slice_rad[:, np.newaxis] >= region_lower)
+                  & (centers[:, :dim] + slice_rad[:, np.newaxis] <= region_upper)).all(axis=1)
+    if exceeding.any():
+        centers, rad2 = centers[exceeding], rad2[exceeding]
+        candidates = _TILE_DATA['points_tree'].query_ball_point(centers[:, :dim], slice_rad[exceeding] * (1 + 1e-9))
+        sphere_index = np.repeat(np.arange(len(candidates)), [len(c) for c in candidates])
+        point_index = np.fromiter(itertools.chain.from_iterable(candidates), dtype=int, count=len(sphere_index))
+        sphere_index, point_index = sphere_index[~in_region[point_index]], point_index[~in_region[point_index]]
+        sq_distances = np.square(lifted_points[point_index] - centers[sphere_index]).sum(axis=1)
+        violating.append(point_index[sq_distances <= rad2[sphere_index] * (1 + 1e-9)])
+
+    simplex_index, opposite_index = np.nonzero(neighbors == -1)
+    facet_columns = np.array([[j for j in range(simplices.shape[1]) if j != k] for k in range(simplices.shape[1])])
+    facets = simplices[simplex_index[:, np.newaxis], facet_columns[opposite_index]]
+    checked = _colorful(labels[facets], labels_number)
+    facets, opposite = facets[checked], simplices[simplex_index[checked], opposite_index[checked]]
+    if len(facets) > 0:
+        outside_indices = np.flatnonzero(~in_region)
+        outside = lifted_points[outside_indices]
+        facets_points = lifted_points[facets]
+        normals = np.linalg.svd(facets_points[:, 1:] - facets_points[:, :1])[2][:, -1]  # normals of the hyperplanes
+        normals *= -np.sign(np.einsum('fi,fi->f', lifted_points[opposite] - facets_points[:, 0], normals))[:, None]
+        offsets = np.einsum('fi,fi->f', facets_points[:, 0], normals)
+        tolerance = 1e-9 * np.abs(lifted_points).max()
+        chunk = max(1, 10 ** 7 // len(outside))
+        for start in range(0, len(facets), chunk):
+            beyond = outside @ normals[start: start + chunk].T >= offsets[start: start + chunk] - tolerance
+            violating.append(outside_indices[beyond.any(axis=1)])
+
+    return np.unique(np.concatenate(violating)) if violating else np.empty(0, dtype=int)
+
+
+def _depths_in_hull(points: npt.NDArray, equations: npt.NDArray) -> npt.NDArray:
+    """Return the distances of the points to the boundary of the convex hull with the given facet equations (of
+    `ConvexHull`), positive inside. Outside, the values are negative (and bound the distance from below)."""
+    chunk = max(1, 10 ** 7 // len(equations))
+    return -np.concatenate([(points[start: start + chunk] @ equations[:, :-1].T + equations[:, -1]).max(axis=1)
+                            for start in range(0, max(len(points), 1), chunk)])
+
+
+def _colorful(simplices_labels: npt.NDArray, labels_number: int) -> npt.NDArray:
+    """Return the boolean mask of the rows of the given array of labels of simplices containing all labels."""
+    sorted_labels = np.sort(simplices_labels, axis=1)
+    return (np.diff(sorted_labels, axis=1) != 0).sum(axis=1) + 1 == labels_number
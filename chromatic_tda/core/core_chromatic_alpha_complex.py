@@ -1,9 +1,13 @@
+from typing import Optional
+
 import numpy as np
 import numpy.typing as npt
 
 from chromatic_tda.algorithms.chromatic_subcomplex_utils import ChromaticComplexUtils
 from chromatic_tda.core.core_simplicial_complex import CoreSimplicialComplex
 from chromatic_tda.utils.legacy_geometrical_utils import sq_dist
+from chromatic_tda.utils.lru_cache import LRUCache
+from chromatic_tda.utils.metrics import Metrics
 
 
 class CoreChromaticAlphaComplex:
@@ -12,14 +16,18 @@ class CoreChromaticAlphaComplex:
     input_labels_to_internal_labels_dict: dict
     internal_labels_to_input_labels_dict: dict
     labels_number: int
-    internal_labeling: list
+    internal_labeling: npt.NDArray  # int array of the internal label of each point
     simplicial_complex: CoreSimplicialComplex
+    circumstack_cache: Optional[LRUCache]
+    metrics: Metrics
 
     def __init__(self) -> None:
         self.input_labels_to_internal_labels_dict = {}
         self.labels_number = 0
-        self.internal_labeling = []
+        self.internal_labeling = np.zeros(0, dtype=int)
         self.sq_rad = {}
+        self.circumstack_cache = None  # {simplex : smallest circumstack}, kept in the incremental mode
+        self.metrics = Metrics()  # of the construction, the metrics of the reductions are in the simplicial complexes
 
     def __iter__(self):
         yield from self.simplicial_complex
@@ -1,7 +1,11 @@
 import numpy as np
 
+from typing import Optional
+
 from chromatic_tda.utils.boundary_matrix_utils import BoundaryMatrixUtils
+from chromatic_tda.utils.filter_functions import FilterFunctions
 from chromatic_tda.utils.floating_point_utils import FloatingPointUtils
+from chromatic_tda.utils.metrics import Metrics
 
 
 class CoreSimplicialComplex:
@@ -13,6 +17,9 @@ class CoreSimplicialComplex:
     persistence_data: dict
     birth_death: dict
     dimension: int
+    total_filtration: Optional[dict]
+    max_homology_dim: Optional[int]
+    metrics: Metrics
 
     def __init__(self) -> None:
         self.clear()
@@ -38,6 +45,9 @@ class CoreSimplicialComplex:
         self.birth_death = {}
 
         self.dimension = 0
+        self.total_filtration = None  # cache of get_total_filtration, reset when the weights change
+        self.max_homology_dim = None  # the complex is only a skeleton, the bars are correct up to this dimension
+        self.metrics = Metrics()
 
     def clear_empty_dimensions(self) -> None:
         clear_dims = []
@@ -58,6 +68,9 @@ class CoreSimplicialComplex:
             raise ValueError("Persistence not yet computed, run `compute_persistence` first.")
         if group not in self.birth_death:
             raise ValueError(f"Persistence for `{group}` not computed. Did you run `compute_persistence`?")
+        if dim is not None and self.max_homology_dim is not None and dim > self.max_homology_dim:
+            raise ValueError(f"Bars of dimension {dim} are not available, "
+                             f"the complex was built only for dimensions up to {self.max_homology_dim}.")
 
         dim_bars_finite: list[tuple[int, tuple[float, float]]] = [
             (len(s) - 1 if group != 'kernel' else len(s) - 2,
@@ -71,6 +84,8 @@ class CoreSimplicialComplex:
                  (self.simplex_weights[s], np.inf)) for s in self.birth_death[group]['essential']
             ]
         dim_bars = dim_bars_finite + dim_bars_infinite
+        if self.max_homology_dim is not None:
+            dim_bars = [(bar_dim, bar) for bar_dim, bar in dim_bars if bar_dim <= self.max_homology_dim]
 
         if dim is None:
             return sorted([b for b in dim_bars if not FloatingPointUtils.is_trivial_bar(b[1])])
@@ -110,6 +125,24 @@ class CoreSimplicialComplex:
         co_boundary = (self.co_boundary if self.co_boundary
                        else BoundaryMatrixUtils.make_co_boundary(self.boundary))
         FloatingPointUtils.ensure_weights_monotonicity_and_equal_values(self.simplex_weights, co_boundary)
+        self.total_filtration = None
+
+    def update_simplex_weights(self, weight_function: dict) -> None:
+        """
+        Update the weights of the simplices in `weight_function` and keep the others. The monotonicity is ensured as in
+        `set_simplex_weights`, assuming that it holds for the simplices that are not updated.
+        """
+        for simplex in sorted(weight_function, key=len, reverse=True):
+            self.simplex_weights[simplex] = FloatingPointUtils.ensure_smaller_or_equal(
+                weight_function[simplex], *(self.simplex_weights[co_face] for co_face in self.co_boundary[simplex]))
+        self.total_filtration = None
+
+    def get_total_filtration(self) -> dict:
+        """Return {simplex : rank} for the total order of simplices by weight, then dimension, then lexicographically.
+        The result is cached until the weights are set again."""
+        if self.total_filtration is None:
+            self.total_filtration = FilterFunctions.compute_total_filtration(self.simplex_weights)
+        return self.total_filtration
 
     def get_weight_function_copy(self) -> dict:
         """Return copy of {simplex : weight} dictionary."""
@@ -125,6 +158,25 @@ class CoreSimplicialComplex:
     def get_extra_vertices_of_cofaces(self, simplex: tuple[int, ...]) -> list[int, ...]:
         return [(set(co_face) - set(simplex)).pop() for co_face in self.co_boundary[simplex]]
 
+    def get_extra_vertices_of_cofaces_csr(self, simplices: list[tuple[int, ...]],
+                                          co_boundary: Optional[dict[tuple, set]] = None) \
+            -> tuple[np.ndarray, np.ndarray]:
+        """Return `get_extra_vertices_of_cofaces` of all given simplices of one dimension in CSR layout, as arrays
+        (offsets, extra_vertices): the extra vertices of the cofaces of simplices[i] are
+        extra_vertices[offsets[i]:offsets[i + 1]]. The extra vertex is the difference of the sums of the vertices of
+        the coface and the simplex. If `co_boundary` is given, it is used instead of the co-boundary of the complex."""
+        if co_boundary is None:
+            co_boundary = self.co_boundary
+        if len(simplices) == 0:
+            return np.zeros(1, dtype=int), np.zeros(0, dtype=int)
+        dim = len(simplices[0]) - 1
+        co_faces = [co_face for simplex in simplices for co_face in co_boundary.get(simplex, ())]
+        counts = np.array([len(co_boundary.get(simplex, ())) for simplex in simplices], dtype=int)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        co_face_sums = np.array(co_faces, dtype=int).reshape(-1, dim + 2).sum(axis=1)
+        simplex_sums = np.array(simplices, dtype=int).reshape(-1, dim + 1).sum(axis=1)
+        return offsets, co_face_sums - np.repeat(simplex_sums, counts)
+
     def set_sub_complex(self, simplices) -> None:
         """Sets a sub_complex generated by given list of simplices."""
         simplices = set(tuple(sorted(s)) for s in simplices)
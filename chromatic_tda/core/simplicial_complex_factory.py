@@ -81,5 +81,6 @@ class CoreSimplicialComplexFactory:
         new_complex.simplex_weights = {simplex : simplicial_complex.simplex_weights[simplex]
                                        for simplex in new_complex.boundary}
         new_complex.sub_complex = simplicial_complex.sub_complex & restricted_simplices_set
+        new_complex.max_homology_dim = simplicial_complex.max_homology_dim
 
         return new_complex
@@ -1,19 +1,44 @@
 import numpy as np
 from dataclasses import dataclass
-
-from chromatic_tda.utils.floating_point_utils import FloatingPointUtils
+from typing import Optional
 
 
 @dataclass
 class StackOfSpheres:
     center: np.array
-    radii: dict[any, float]
+    radii: np.array  # squared radius of the sphere of each (internal) label, NaN for the labels without a sphere
     maximum_radius: float
-    maximum_labels: set
+    maximum_labels: np.array
 
-    def __init__(self, center: np.array, radii: dict[any, float]):
+    def __init__(self, center: np.array, radii: np.array, maximum_radius: Optional[float] = None,
+                 maximum_labels: Optional[np.array] = None):
+        """The maximum radius and the labels attaining it are computed unless given."""
         self.center = center
         self.radii = radii
-        self.maximum_radius = max(radii.values())
-        self.maximum_labels = {label for label, radius in self.radii.items()
-                               if FloatingPointUtils.is_close(radius, self.maximum_radius)}
+        if maximum_radius is None or maximum_labels is None:
+            maximum_radius, maximum_labels = (x[0] for x in StackOfSpheres.maxima_of_radii(radii[np.newaxis]))
+        self.maximum_radius = maximum_radius
+        self.maximum_labels = maximum_labels
+
+    @property
+    def labels(self) -> np.array:
+        """The labels of the spheres of the stack."""
+        return np.flatnonzero(~np.isnan(self.radii))
+
+    @staticmethod
+    def maxima_of_radii(radii: np.array) -> tuple[np.array, list[np.array]]:
+        """Given the radii of m stacks as an array of shape (m, number of labels), return their maximum radii and the
+        arrays of labels with radius close to the maximum, as FloatingPointUtils.is_close(radius, maximum)."""
+        maximum_radii = np.nanmax(radii, axis=1)
+        maximum_column = maximum_radii[:, np.newaxis]
+        is_maximum = np.where(np.abs(maximum_column) > .01, np.isclose(radii, maximum_column),
+                              np.isclose(radii, maximum_column, atol=1e-12))
+        return maximum_radii, [np.flatnonzero(row) for row in is_maximum]
+
+    @staticmethod
+    def stacks_from_arrays(centers: np.array, radii: np.array) -> list['StackOfSpheres']:
+        """Return the stacks with the given centers (shape (m, d)) and radii (shape (m, number of labels))."""
+        maximum_radii, maximum_labels = StackOfSpheres.maxima_of_radii(radii)
+        return [StackOfSpheres(center, stack_radii, maximum_radius, stack_maximum_labels)
+                for center, stack_radii, maximum_radius, stack_maximum_labels
+                in zip(centers, radii, maximum_radii.tolist(), maximum_labels)]
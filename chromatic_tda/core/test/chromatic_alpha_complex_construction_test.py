@@ -1,10 +1,15 @@
 import unittest
 from pathlib import Path
+from unittest import mock
 import json
+import random
 import numpy as np
 
 from chromatic_tda.core.chromatic_alpha_complex_factory import CoreChromaticAlphaComplexFactory
 from chromatic_tda.core.core_chromatic_alpha_complex import CoreChromaticAlphaComplex
+from chromatic_tda.entities.chromatic_alpha_complex import ChromaticAlphaComplex
+from chromatic_tda.utils.metrics import Metrics
+from scipy.spatial import Delaunay
 
 
 class ChromaticAlphaComplexConstructionTest(unittest.TestCase):
@@ -35,9 +40,145 @@ class ChromaticAlphaComplexConstructionTest(unittest.TestCase):
         result = self.single_test(data_name='chralph_integer_2_2')
         assert result
 
-    def single_test(self, data_name, data_folder=None):
+    def test_chromatic_alpha_random_15_8_7_tiled(self):
+        result = self.single_test(data_name='chralph_random_15_8_7', tiles=2)
+        assert result
+
+    def test_tiled_same_as_single_delaunay(self):
+        rng = np.random.default_rng(0)
+        for points, labels, tiles in [(rng.random((2000, 2)), rng.integers(0, 3, 2000), 3),
+                                      (rng.random((1000, 3)), rng.integers(0, 2, 1000), (2, 1, 2))]:
+            maximal_simplices = self.chromatic_delaunay(CoreChromaticAlphaComplexFactory(points, labels))
+            maximal_simplices_tiled = self.chromatic_delaunay(CoreChromaticAlphaComplexFactory(points, labels,
+                                                                                               tiles=tiles))
+            assert set(maximal_simplices) == set(maximal_simplices_tiled)
+
+    def test_tiled_in_processes_same_as_single_delaunay(self):
+        rng = np.random.default_rng(2)
+        points, labels = rng.random((1500, 2)), rng.integers(0, 3, 1500)
+        maximal_simplices = self.chromatic_delaunay(CoreChromaticAlphaComplexFactory(points, labels))
+        maximal_simplices_tiled = self.chromatic_delaunay(CoreChromaticAlphaComplexFactory(points, labels, tiles=2,
+                                                                                           n_jobs=2))
+        assert set(maximal_simplices) == set(maximal_simplices_tiled)
+
+    def test_tiled_single_pass_per_tile(self):
+        rng = np.random.default_rng(0)
+        points, labels = rng.random((4000, 2)), rng.integers(0, 3, 4000)
+        with mock.patch('chromatic_tda.core.chromatic_alpha_complex_factory.Delaunay', wraps=Delaunay) as delaunay:
+            self.chromatic_delaunay(CoreChromaticAlphaComplexFactory(points, labels, tiles=3))
+        assert delaunay.call_count == 1 + 9  # the band of the seeds and a single Delaunay complex of each tile
+
+    def test_chromatic_pattern_same_as_restricted(self):
+        rng = np.random.default_rng(1)
+        points, labels = rng.random((120, 2)), rng.integers(0, 4, 120)
+        alpha = CoreChromaticAlphaComplexFactory(points, labels).create_instance(
+            lift_perturbation=1e-9, point_perturbation=None)
+        for pattern in ['bi-chromatic', [[0, 1, 2], [2, 3], [3]]]:
+            alpha_pattern = CoreChromaticAlphaComplexFactory(points, labels, chromatic_pattern=pattern).create_instance(
+                lift_perturbation=1e-9, point_perturbation=None)
+            weights = alpha.get_simplicial_complex(sub_complex=None, full_complex=pattern, relative=None,
+                                                   allow_unused_labels=False).get_weight_function_copy()
+            weights_pattern = alpha_pattern.simplicial_complex.get_weight_function_copy()
+            assert set(weights) == set(weights_pattern)
+            assert all(np.isclose(weights[s], weights_pattern[s]) for s in weights)
+
+    def test_max_radius_same_as_truncated(self):
+        for seed, n, dimension in [(2, 150, 2), (3, 50, 3)]:
+            rng = np.random.default_rng(seed)
+            points, labels = rng.random((n, dimension)), rng.integers(0, 3, n)
+            random.seed(0)
+            weights = CoreChromaticAlphaComplexFactory(points, labels).create_instance(
+                lift_perturbation=1e-9, point_perturbation=None).simplicial_complex.get_weight_function_copy()
+            for max_radius in [.05, .15]:
+                random.seed(0)
+                factory = CoreChromaticAlphaComplexFactory(points, labels, max_radius=max_radius)
+                weights_truncated = factory.create_instance(
+                    lift_perturbation=1e-9, point_perturbation=None).simplicial_complex.get_weight_function_copy()
+                assert set(weights_truncated) == {s for s in weights if weights[s] <= max_radius}
+                assert all(np.isclose(weights[s], weights_truncated[s]) for s in weights_truncated)
+
+    def test_max_homology_dim_same_as_skeleton(self):
+        rng = np.random.default_rng(4)
+        points, labels = rng.random((50, 3)), rng.integers(0, 3, 50)
+        random.seed(0)
+        alpha = ChromaticAlphaComplex(points, labels)
+        random.seed(0)
+        alpha_skeleton = ChromaticAlphaComplex(points, labels, max_homology_dim=1)
+        weights = alpha.weight_function()
+        weights_skeleton = alpha_skeleton.weight_function()
+        assert set(weights_skeleton) == {s for s in weights if len(s) <= 3}
+        assert all(np.isclose(weights[s], weights_skeleton[s]) for s in weights_skeleton)
+
+        complex_full = alpha.get_simplicial_complex(sub_complex='bi-chromatic')
+        complex_skeleton = alpha_skeleton.get_simplicial_complex(sub_complex='bi-chromatic')
+        complex_full.compute_persistence()
+        complex_skeleton.compute_persistence()
+        for group in ['complex', 'sub_complex', 'image', 'kernel', 'cokernel', 'relative']:
+            for dim in [0, 1]:
+                assert np.allclose(complex_full.bars(group, dim), complex_skeleton.bars(group, dim))
+            assert set(complex_skeleton.bars(group)) <= {0, 1}
+        with self.assertRaises(ValueError):
+            complex_skeleton.bars('complex', dim=2)
+
+    def test_delaunay_backends_same_as_default(self):
+        rng = np.random.default_rng(5)
+        points, labels = rng.random((300, 2)), rng.integers(0, 3, 300)
+        factory = CoreChromaticAlphaComplexFactory(points, labels)
+        max_simplices = set(self.chromatic_delaunay(factory))
+        random.seed(0)
+        lifted_points = factory.chromatic_lift(lift_perturbation=1e-9)
+
+        for factory_kwargs in [dict(qhull_options='Qbb Qc Qz Q12'),
+                               dict(delaunay_simplices=Delaunay(lifted_points).simplices),
+                               dict(delaunay_simplices=list(max_simplices)),
+                               dict(delaunay_backend=lambda lifted: Delaunay(lifted, qhull_options='Qbb Qc').simplices)]:
+            factory = CoreChromaticAlphaComplexFactory(points, labels, **factory_kwargs)
+            assert set(self.chromatic_delaunay(factory)) == max_simplices
+        with self.assertRaises(ValueError):
+            CoreChromaticAlphaComplexFactory(points, labels, tiles=2, delaunay_simplices=list(max_simplices))
+
+    def test_incremental_same_as_from_scratch(self):
+        rng = np.random.default_rng(6)
+        points, labels = rng.random((150, 2)), rng.integers(0, 3, 150)
+        random.seed(0)
+        weights = CoreChromaticAlphaComplexFactory(points, labels).create_instance(
+            lift_perturbation=1e-9, point_perturbation=None).simplicial_complex.get_weight_function_copy()
+        random.seed(0)
+        factory = CoreChromaticAlphaComplexFactory(points[:120], labels[:120], incremental=True)
+        factory.create_instance(lift_perturbation=1e-9, point_perturbation=None)
+        factory.add_points(points[120:140], labels[120:140])
+        alpha = factory.add_points(points[140:], labels[140:])
+
+        weights_incremental = alpha.simplicial_complex.get_weight_function_copy()
+        assert set(weights_incremental) == set(weights)
+        assert all(np.isclose(weights[s], weights_incremental[s]) for s in weights)
+        with self.assertRaises(ValueError):
+            factory.add_points([[.5, .5]], [3])
+
+    def test_incremental_reuses_circumstacks(self):
+        rng = np.random.default_rng(7)
+        points, labels = rng.random((300, 2)), rng.integers(0, 2, 300)
+        Metrics.enable()
+        try:
+            factory = CoreChromaticAlphaComplexFactory(points[:290], labels[:290], incremental=True)
+            alpha_complex = factory.create_instance(lift_perturbation=1e-9, point_perturbation=None)
+            assert "Rad :: Circumstack Cache :: Hits" not in alpha_complex.metrics.as_dict()
+            factory.add_points(points[290:], labels[290:])
+        finally:
+            Metrics.disable()
+        assert alpha_complex.metrics.as_dict()["Rad :: Circumstack Cache :: Hits"] > 0
+
+    @staticmethod
+    def chromatic_delaunay(factory: CoreChromaticAlphaComplexFactory):
+        factory.alpha_complex = CoreChromaticAlphaComplex()
+        factory.init_points(factory.points, point_perturbation=None)
+        factory.init_labels(factory.labels)
+        random.seed(0)  # the same lift perturbation
+        return factory.compute_chromatic_delaunay(lift_perturbation=1e-9)
+
+    def single_test(self, data_name, data_folder=None, **factory_kwargs):
         data = self.load_data(data_name, data_folder)
-        factory = CoreChromaticAlphaComplexFactory(points=data['points'], labels=data['labels'])
+        factory = CoreChromaticAlphaComplexFactory(points=data['points'], labels=data['labels'], **factory_kwargs)
         alpha = factory.create_instance(lift_perturbation=1e-9, point_perturbation=None)
         return self.compare_complex(alpha, data['weight_function'])
 
@@ -60,3 +201,15 @@ class ChromaticAlphaComplexConstructionTest(unittest.TestCase):
             if not np.isclose(computed_weight, reference_weight):
                 return False
         return True  # simplices identical to the reference, and all the weights are close to the reference
+
+    def test_extra_vertices_of_cofaces_csr(self):
+        rng = np.random.default_rng(7)
+        alpha = CoreChromaticAlphaComplexFactory(rng.random((40, 2)), rng.integers(0, 3, 40)).create_instance(
+            lift_perturbation=1e-9, point_perturbation=None)
+        complex_ = alpha.simplicial_complex
+        for dim in range(complex_.dimension):
+            simplices = list(complex_.dim_simplex_dict[dim])
+            offsets, extra_vertices = complex_.get_extra_vertices_of_cofaces_csr(simplices)
+            for i, simplex in enumerate(simplices):
+                assert sorted(extra_vertices[offsets[i]:offsets[i + 1]]) == \
+                       sorted(complex_.get_extra_vertices_of_cofaces(simplex))
@@ -0,0 +1,113 @@
+import unittest
+import numpy as np
+
+from chromatic_tda.core.chromatic_alpha_complex_factory import CoreChromaticAlphaComplexTorusFactory, \
+    CoreChromaticAlphaComplexTorus2DFactory
+from chromatic_tda.core.core_chromatic_alpha_complex import CoreChromaticAlphaComplex
+from chromatic_tda.entities.chromatic_alpha_complex import ChromaticAlphaComplex
+
+
+class ChromaticAlphaComplexTorusTest(unittest.TestCase):
+
+    @staticmethod
+    def random_factory(seed, n=200, factory_class=CoreChromaticAlphaComplexTorus2DFactory):
+        rng = np.random.default_rng(seed)
+        points = rng.random((n, 2)) * [2, 1]
+        labels = rng.integers(0, 2, n)
+        return factory_class(points, labels, xrange=(0, 2), yrange=(0, 1))
+
+    def test_periodic_images_strips(self):
+        factory = self.random_factory(seed=0)
+        points, preimage = factory.get_periodic_images(factory.points, margin=.1)
+        assert (points[:factory.n] == factory.points).all()
+        assert ((points >= factory.ranges[:, 0] - .1) & (points <= factory.ranges[:, 1] + .1)).all()
+        shifts = (points - factory.points[preimage]) / factory.periods
+        assert np.allclose(shifts, np.round(shifts))
+        assert len(points) < 2 * factory.n
+
+    def test_periodic_images_full_grid(self):
+        factory = self.random_factory(seed=0)
+        points, preimage = factory.get_periodic_images(factory.points, margin=factory.periods.max())
+        assert len(points) == 9 * factory.n
+        assert (np.bincount(preimage) == 9).all()
+
+    def test_strips_same_as_full_grid(self):
+        factory_strips = self.random_factory(seed=1)
+        factory_full = self.random_factory(seed=1)
+        factory_full.initial_margin = lambda: factory_full.periods.max()
+        alpha_strips = factory_strips.create_instance(lift_perturbation=1e-9, point_perturbation=None)
+        alpha_full = factory_full.create_instance(lift_perturbation=1e-9, point_perturbation=None)
+
+        weights_strips = alpha_strips.simplicial_complex.get_weight_function_copy()
+        weights_full = alpha_full.simplicial_complex.get_weight_function_copy()
+        assert set(weights_strips) == set(weights_full)
+        assert all(np.isclose(weights_strips[s], weights_full[s]) for s in weights_full)
+
+    def test_radius_on_representatives_same_as_restricted(self):
+        factory = self.random_factory(seed=2)
+        alpha = factory.create_instance(lift_perturbation=1e-9, point_perturbation=None)
+        weights = alpha.simplicial_complex.get_weight_function_copy()
+
+        factory.alpha_complex.simplicial_complex = None
+        factory.build_alpha_complex_structure_torus(lift_perturbation=1e-9)
+        factory.add_radius_function(use_morse_optimization=True, legacy_radius_function=False)
+        factory.restrict_to_torus_simplices()
+        weights_restricted = factory.alpha_complex.simplicial_complex.get_weight_function_copy()
+
+        assert set(weights) == set(weights_restricted)
+        assert all(np.isclose(weights[s], weights_restricted[s]) for s in weights)
+
+    def test_fibers_of_maximal_simplices(self):
+        factory = self.random_factory(seed=3)
+        factory.alpha_complex = CoreChromaticAlphaComplex()
+        max_simplices = np.array(factory.compute_chromatic_delaunay_torus(lift_perturbation=1e-9))
+        assert factory.check_fibers_of_maximal_simplices(max_simplices)
+
+        wrapping = np.flatnonzero((max_simplices >= factory.n).any(axis=1))[0]
+        assert not factory.check_fibers_of_maximal_simplices(np.delete(max_simplices, wrapping, axis=0))
+
+    def test_torus_simplices_representatives(self):
+        factory = self.random_factory(seed=4)
+        factory.alpha_complex = CoreChromaticAlphaComplex()
+        factory.build_alpha_complex_structure_torus(lift_perturbation=1e-9)
+        dim_simplex_dict = factory.alpha_complex.simplicial_complex.dim_simplex_dict
+        torus_simplex_of, representatives = factory.compute_torus_simplices(dim_simplex_dict)
+
+        assert set(torus_simplex_of) == set().union(*dim_simplex_dict.values())
+        assert len({torus_simplex_of[s] for s in representatives}) == len(representatives)
+        assert set(torus_simplex_of.values()) == {torus_simplex_of[s] for s in representatives}
+        assert {s for s in representatives if len(s) == 1} == {(v,) for v in range(factory.n)}
+
+    def test_torus_3d_strips_same_as_full_grid(self):
+        rng = np.random.default_rng(5)
+        points = rng.random((200, 3)) * [1, 2, 1]
+        labels = [0] * 200  # a single label keeps the 3D test fast
+        factory_strips = CoreChromaticAlphaComplexTorusFactory(points, labels, ranges=[(0, 1), (0, 2), (0, 1)])
+        factory_full = CoreChromaticAlphaComplexTorusFactory(points, labels, ranges=[(0, 1), (0, 2), (0, 1)])
+        factory_full.initial_margin = lambda: factory_full.periods.max()
+        alpha_strips = factory_strips.create_instance(lift_perturbation=1e-9, point_perturbation=None)
+        alpha_full = factory_full.create_instance(lift_perturbation=1e-9, point_perturbation=None)
+
+        assert len(alpha_full.points) == 27 * 200
+        assert len(alpha_strips.points) < len(alpha_full.points)
+        weights_strips = alpha_strips.simplicial_complex.get_weight_function_copy()
+        weights_full = alpha_full.simplicial_complex.get_weight_function_copy()
+        assert set(weights_strips) == set(weights_full)
+        assert all(np.isclose(weights_strips[s], weights_full[s]) for s in weights_full)
+        # Euler characteristic of the 3-torus
+        assert sum((-1) ** (len(s) - 1) for s in weights_full) == 0
+
+    def test_frame_not_matching_points(self):
+        points = np.random.default_rng(6).random((20, 3))
+        with self.assertRaises(ValueError):
+            CoreChromaticAlphaComplexTorusFactory(points, [0] * 20, ranges=[(0, 1), (0, 1)])
+        with self.assertRaises(ValueError):
+            CoreChromaticAlphaComplexTorusFactory(points, [0] * 20, ranges=[(0, 1), (0, .5), (0, 1)])
+
+    def test_torus_qhull_options(self):
+        points = np.random.default_rng(7).random((60, 2))
+        labels = [0, 1] * 30
+        alpha = ChromaticAlphaComplex(points, labels, torus=True, xrange=(0, 1), yrange=(0, 1))
+        alpha_options = ChromaticAlphaComplex(points, labels, torus=True, ranges=[(0, 1), (0, 1)],
+                                              qhull_options='Qbb Qc Qz Q12')
+        assert alpha.simplices() == alpha_options.simplices()
@@ -1,6 +1,6 @@
 from chromatic_tda.core.core_chromatic_alpha_complex import CoreChromaticAlphaComplex
 from chromatic_tda.core.chromatic_alpha_complex_factory import CoreChromaticAlphaComplexFactory, \
-    CoreChromaticAlphaComplexTorus2DFactory
+    CoreChromaticAlphaComplexTorusFactory, CoreChromaticAlphaComplexTorus2DFactory
 from chromatic_tda.entities.simplicial_complex import SimplicialComplex
 
 
@@ -21,23 +21,93 @@ class ChromaticAlphaComplex:
             lift_perturbation ... Compute the Delaunay complex with perturbed lifting to break the non-general position.
                                   Generally leads to faster computation, as QHull does not need to deal with the
                                   non-generality itself. (default: 1e-9)
+            torus ... If True, compute the complex of the points on the torus, i.e., with periodic boundary conditions.
+                      The frame is given either by `ranges`, a list of intervals (a, b), one for each coordinate,
+                      or (in 2D) by `xrange` and `yrange`. (default: False)
+            tiles ... If given, the chromatic Delaunay complex is computed on a grid of overlapping tiles, with `tiles`
+                      tiles along each axis (or a list with one number for each axis). The result is the same,
+                      but each Delaunay computation only involves points near one tile. (default: None)
+            n_jobs ... Number of processes computing the tiles in parallel. (default: 1)
+            chromatic_pattern ... If given, only the simplices whose labels are contained in one of the given sets of
+                                  labels are computed. The format is the same as for the parameters of
+                                  `get_simplicial_complex`, e.g., 'bi-chromatic' or [['red', 'blue'], ['red', 'green']].
+                                  The chromatic Delaunay complex is then computed separately for each set of labels,
+                                  which needs much lower dimension than for all labels at once. (default: None)
+            max_radius ... If given, only the simplices with radius at most `max_radius` are kept, i.e., the filtration
+                           is truncated at `max_radius`. Simplices that provably exceed it are dropped before their
+                           radius is computed. The bars still alive at `max_radius` are reported as infinite.
+                           (default: None)
+            max_homology_dim ... If given, only the simplices up to dimension `max_homology_dim` + 1 are built and
+                                 weighted, which is enough for the persistence in dimensions up to
+                                 `max_homology_dim`. The bars of higher dimensions are then not available.
+                                 (default: None)
+            qhull_options ... Options of Qhull for the Delaunay computation, e.g. 'Qbb Qc Qz Q12' or 'QJ'. The options
+                              'Qbb Qc Qz Q12 Q3 Q5' are usually faster for lifts of dimension 3 and 4 (see
+                              chromatic_tda/tests/timing/delaunay_options.py), but Q3 and Q5 are experimental in Qhull.
+                              (default: None, i.e., the defaults of scipy)
+            delaunay_simplices ... Precomputed maximal simplices (as lists of indices of the points) of the Delaunay
+                                   complex of the chromatic lift, or of the chromatic Delaunay complex itself. Only the
+                                   simplices with all labels are used. (default: None)
+            delaunay_backend ... Function computing the array of maximal simplices of the Delaunay triangulation of
+                                 the lifted points given as an array, used instead of Qhull. Not supported with `tiles`.
+                                 (default: None)
+            incremental ... If True, points can be added later by `add_points`, which only updates the part of the
+                            complex whose star changed. Not supported on the torus and together with `tiles`,
+                            `chromatic_pattern`, `max_radius`, `max_homology_dim` or the Delaunay parameters.
+                            (default: False)
         """
-        if kwargs.get('torus', False):
+        if kwargs.get('torus', False) and kwargs.get('chromatic_pattern', None) is not None:
+            raise ValueError("The chromatic_pattern parameter is not supported on the torus.")
+        if kwargs.get('torus', False) and kwargs.get('max_homology_dim', None) is not None:
+            raise ValueError("The max_homology_dim parameter is not supported on the torus.")
+        if kwargs.get('torus', False) and kwargs.get('delaunay_simplices', None) is not None:
+            raise ValueError("The delaunay_simplices parameter is not supported on the torus.")
+        if kwargs.get('torus', False) and kwargs.get('incremental', False):
+            raise ValueError("The incremental parameter is not supported on the torus.")
+        if kwargs.get('torus', False) and kwargs.get('ranges', None) is not None:
+            factory = CoreChromaticAlphaComplexTorusFactory(points, labels,
+                                                            ranges= kwargs.get('ranges'),
+                                                            suppress_wrapping_check= kwargs.get(
+                                                                'suppress_wrapping_check', False),
+                                                            suppress_boundary_consistency_check= kwargs.get(
+                                                                'suppress_boundary_consistency_check', False),
+                                                            max_radius= kwargs.get('max_radius', None),
+                                                            qhull_options= kwargs.get('qhull_options', None),
+                                                            delaunay_backend= kwargs.get('delaunay_backend', None))
+        elif kwargs.get('torus', False):
             factory = CoreChromaticAlphaComplexTorus2DFactory(points, labels,
                                                               xrange= kwargs.get('xrange', None),
                                                               yrange= kwargs.get('yrange', None),
                                                               suppress_wrapping_check= kwargs.get(
                                                                   'suppress_wrapping_check', False),
                                                               suppress_boundary_consistency_check= kwargs.get(
-                                                                  'suppress_boundary_consistency_check', False))
+                                                                  'suppress_boundary_consistency_check', False),
+                                                              max_radius= kwargs.get('max_radius', None),
+                                                              qhull_options= kwargs.get('qhull_options', None),
+                                                              delaunay_backend= kwargs.get('delaunay_backend', None))
         else:
-            factory = CoreChromaticAlphaComplexFactory(points, labels)
+            factory = CoreChromaticAlphaComplexFactory(points, labels,
+                                                       tiles= kwargs.get('tiles', None),
+                                                       n_jobs= kwargs.get('n_jobs', 1),
+                                                       chromatic_pattern= kwargs.get('chromatic_pattern', None),
+                                                       max_radius= kwargs.get('max_radius', None),
+                                                       max_homology_dim= kwargs.get('max_homology_dim', None),
+                                                       qhull_options= kwargs.get('qhull_options', None),
+                                                       delaunay_simplices= kwargs.get('delaunay_simplices', None),
+                                                       delaunay_backend= kwargs.get('delaunay_backend', None),
+                                                       incremental= kwargs.get('incremental', False))
+        self.factory = factory
         self.core_alpha_complex : CoreChromaticAlphaComplex = factory.create_instance(
             lift_perturbation=lift_perturbation, point_perturbation=point_perturbation)
 
     def __iter__(self):
         yield from self.core_alpha_complex
 
+    def add_points(self, points, labels) -> None:
+        """Add points with labels (from the labels already used) to a complex created with incremental=True.
+        The simplicial complexes given by `get_simplicial_complex` before are not updated."""
+        self.core_alpha_complex = self.factory.add_points(points, labels)
+
     def __len__(self) -> int:
         return len(self.core_alpha_complex)
 
@@ -83,6 +153,13 @@ class ChromaticAlphaComplex:
             return self.core_alpha_complex.simplicial_complex.get_weight_function_copy()
         return self.core_alpha_complex.simplicial_complex.get_simplex_weight(simplex)
 
+    def metrics(self) -> dict:
+        """Return the metrics of the construction, e.g. the numbers of simplices of each dimension, of circumstacks
+        computed and of radii taken from the cofaces, as a dictionary {name : value}. The metrics are only recorded
+        after calling `chromatic_tda.Metrics.enable()`. The metrics of the persistence are given by
+        `SimplicialComplex.metrics`."""
+        return self.core_alpha_complex.metrics.as_dict()
+
     def simplices(self):
         """Return list of all simplices sorted by dimension and then lexicographically (w.r.t. vertex indices)."""
         return set(self.core_alpha_complex.simplicial_complex.get_simplices())
@@ -26,8 +26,16 @@ class SimplicialComplex:
     def __contains__(self, element) -> bool:
         return element in self.core_complex
 
-    def compute_persistence(self):
-        PersistenceAlgorithm(simplicial_complex=self.core_complex).compute_persistence()
+    def compute_persistence(self, n_jobs : int = 1):
+        """Compute the six-pack of persistence diagrams.
+
+        Keyword arguments:
+            n_jobs ... Number of processes used for the matrix reductions. If greater than 1, the six reductions are
+                       scheduled concurrently, each as soon as the reductions it depends on are done. Only the
+                       pivots are then kept, not the reduced matrices used by the experimental FeatureExtractor.
+                       (default: 1)
+        """
+        PersistenceAlgorithm(simplicial_complex=self.core_complex).compute_persistence(n_jobs=n_jobs)
 
     def dimension(self) -> int:
         """Return the dimension of the simplicial complex"""
@@ -107,6 +115,12 @@ class SimplicialComplex:
             return self.core_complex.get_weight_function_copy()
         return self.core_complex.get_simplex_weight(simplex)
 
+    def metrics(self) -> dict:
+        """Return the metrics of the persistence computation, i.e., the column additions and the fill-in of each of the
+        six reductions, as a dictionary {name : value}. The metrics are only recorded after calling
+        `chromatic_tda.Metrics.enable()`."""
+        return self.core_complex.metrics.as_dict()
+
     def simplices_of_dim(self, dim : int) -> list:
         """Return list of all simplices ."""
         return self.core_complex.get_simplices_of_dim(dim)
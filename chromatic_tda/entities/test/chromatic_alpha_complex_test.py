@@ -0,0 +1,28 @@
+import random
+import unittest
+import numpy as np
+
+from chromatic_tda.core.chromatic_alpha_complex_factory import CoreChromaticAlphaComplexTorusFactory, \
+    CoreChromaticAlphaComplexTorus2DFactory
+from chromatic_tda.entities.chromatic_alpha_complex import ChromaticAlphaComplex
+
+
+class ChromaticAlphaComplexTest(unittest.TestCase):
+
+    def test_torus_same_as_torus_factory(self):
+        rng = np.random.default_rng(0)
+        points, labels = rng.random((200, 2)) * [2, 1], rng.integers(0, 2, 200)
+        for kwargs, factory_class in [(dict(xrange=(0, 2), yrange=(0, 1)), CoreChromaticAlphaComplexTorus2DFactory),
+                                      (dict(ranges=[(0, 2), (0, 1)]), CoreChromaticAlphaComplexTorusFactory)]:
+            random.seed(0)
+            weights = ChromaticAlphaComplex(points, labels, torus=True, **kwargs).weight_function()
+            random.seed(0)
+            weights_factory = factory_class(points, labels, **kwargs).create_instance(
+                lift_perturbation=1e-9, point_perturbation=None).simplicial_complex.get_weight_function_copy()
+            assert set(weights) == set(weights_factory)
+            assert all(np.isclose(weights[s], weights_factory[s]) for s in weights)
+
+    def test_torus_rejects_max_homology_dim(self):
+        with self.assertRaises(ValueError):
+            ChromaticAlphaComplex([[0, 0], [.5, .5]], [0, 1], torus=True, xrange=(0, 1), yrange=(0, 1),
+                                  max_homology_dim=1)
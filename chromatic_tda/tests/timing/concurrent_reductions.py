@@ -0,0 +1,54 @@
+from time import perf_counter
+
+import numpy as np
+
+from chromatic_tda.algorithms.persistence_algorithm import PersistenceAlgorithm
+from chromatic_tda.algorithms.reduce_matrix import MatrixReduction
+from chromatic_tda.entities.chromatic_alpha_complex import ChromaticAlphaComplex
+
+
+class ConcurrentReductionsTiming:
+    """Compare the six reductions run one after another with their concurrent scheduling. The critical path is the
+    longest chain of dependent reductions (see REDUCTION_PREREQUISITES), the wall time the concurrent scheduling can
+    reach with enough processes. The overhead is that of sending the data to and from the worker processes, measured
+    with a single worker, which runs the reductions one after another as well."""
+
+    def __init__(self, n=3000, points_dimension=2, labels_number=3, n_jobs=(1, 3)):
+        self.n = n
+        self.n_jobs = n_jobs
+        rng = np.random.default_rng(0)
+        alpha_complex = ChromaticAlphaComplex(rng.random((n, points_dimension)), rng.integers(0, labels_number, n))
+        self.simplicial_complex = alpha_complex.get_simplicial_complex(sub_complex='mono-chromatic').core_complex
+
+    def run(self) -> None:
+        print(f"===== Six reductions of the alpha complex of {self.n} points "
+              f"({len(self.simplicial_complex.boundary)} simplices) =====")
+        algorithm = PersistenceAlgorithm(self.simplicial_complex)
+        self.simplicial_complex.persistence_data = {}
+        reduce_times = {}
+        for group in algorithm.REDUCTION_PREREQUISITES:
+            start = perf_counter()
+            self.simplicial_complex.persistence_data[group] = MatrixReduction.reduce(
+                **algorithm._reduction_arguments(group))
+            reduce_times[group] = perf_counter() - start
+            print(f"{group:<28} {reduce_times[group]:8.2f} s")
+
+        finish_times = {}
+        for group, prerequisites in algorithm.REDUCTION_PREREQUISITES.items():  # the keys respect the prerequisites
+            finish_times[group] = max((finish_times[p] for p in prerequisites), default=0) + reduce_times[group]
+        sequential = sum(reduce_times.values())
+        print(f"{'sum':<28} {sequential:8.2f} s")
+        print(f"{'critical path':<28} {max(finish_times.values()):8.2f} s")
+
+        for n_jobs in self.n_jobs:
+            start = perf_counter()
+            algorithm._compute_persistence_data_concurrently(n_jobs=n_jobs)
+            wall = perf_counter() - start
+            overhead = f"  (overhead {wall - sequential:+.2f} s)" if n_jobs == 1 else ""
+            print(f"{f'concurrent, {n_jobs} processes':<28} {wall:8.2f} s{overhead}")
+        print(55*"=" + "\n")
+
+
+if __name__ == "__main__":
+    ConcurrentReductionsTiming(3000, points_dimension=2, labels_number=3).run()
+    ConcurrentReductionsTiming(600, points_dimension=3, labels_number=2).run()
@@ -0,0 +1,49 @@
+import random
+from time import perf_counter
+
+import numpy as np
+from scipy.spatial import Delaunay
+
+from chromatic_tda.core.chromatic_alpha_complex_factory import CoreChromaticAlphaComplexFactory
+from chromatic_tda.core.core_chromatic_alpha_complex import CoreChromaticAlphaComplex
+
+
+class DelaunayOptionsTiming:
+    """Compare the running time of the Delaunay computation of the chromatic lift for different Qhull options.
+    The first two are the defaults of scipy for lifts of dimension at most 4 and above (used if `qhull_options` is
+    None), the others can be passed as `qhull_options`."""
+
+    OPTIONS = ['Qbb Qc Qz Q12', 'Qbb Qc Qz Qx Q12', 'Qbb Q12', 'Qbb Qc Qz Q12 Q3 Q5', 'QJ']
+
+    def __init__(self, n=10000, points_dimension=2, labels_number=2, options=None, repeat=2):
+        self.n = n
+        self.options = self.OPTIONS if options is None else options
+        self.repeat = repeat
+        rng = np.random.default_rng(0)
+        self.factory = CoreChromaticAlphaComplexFactory(rng.random((n, points_dimension)),
+                                                        rng.integers(0, labels_number, n))
+
+    def run(self) -> None:
+        factory = self.factory
+        factory.alpha_complex = CoreChromaticAlphaComplex()
+        factory.init_points(factory.points, point_perturbation=None)
+        factory.init_labels(factory.labels)
+        random.seed(0)
+        lifted_points = factory.chromatic_lift(lift_perturbation=1e-9)
+        print(f"===== Delaunay of the chromatic lift of {self.n} points, "
+              f"lifted dimension {lifted_points.shape[1]} =====")
+        for options in self.options:
+            times = []
+            for _ in range(self.repeat):
+                start = perf_counter()
+                simplices = Delaunay(lifted_points, qhull_options=options).simplices
+                times.append(perf_counter() - start)
+            print(f"{options:<28} {min(times):8.2f} s  ({len(simplices)} simplices)")
+        print(55*"=" + "\n")
+
+
+if __name__ == "__main__":
+    DelaunayOptionsTiming(100000, points_dimension=2, labels_number=2).run()
+    DelaunayOptionsTiming(50000, points_dimension=2, labels_number=3).run()
+    DelaunayOptionsTiming(30000, points_dimension=3, labels_number=2).run()
+    DelaunayOptionsTiming(5000, points_dimension=3, labels_number=3).run()
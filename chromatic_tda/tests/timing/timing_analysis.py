@@ -2,6 +2,7 @@ import random
 
 from chromatic_tda.entities.chromatic_alpha_complex import ChromaticAlphaComplex
 from chromatic_tda.entities import SimplicialComplex
+from chromatic_tda.utils.profiler import Profiler
 from chromatic_tda.utils.timing import TimingUtils
 
 
@@ -19,6 +20,7 @@ class TimingAnalysis:
 
     def run(self) -> None:
         print(f"===== Delaunay Complex Timing test with {self.n} points, {len(set(self.point_labels))} colors =====")
+        Profiler().enable()
         TimingUtils().start("Total")
 
         TimingUtils().start("Init Complex")
@@ -38,7 +40,7 @@ class TimingAnalysis:
         TimingUtils().stop("Compute Persistence")
 
         TimingUtils().stop("Total")
-        TimingUtils().print()
+        Profiler().print()
         print(55*"=" + "\n")
 
 
@@ -1,16 +1,48 @@
+from typing import Optional
+
+import numpy as np
+
+
 class FilterFunctions:
     """Functions to order tuples according to float values and subset-relation."""
-    def __init__(self, weight_function : dict, sub_complex : set):
+    def __init__(self, weight_function : dict, sub_complex : set, total_filtration : Optional[dict] = None):
         self.weight_function = weight_function
         self.sub_complex = sub_complex
-        self.total_filtration = {simplex : index for index, simplex in enumerate(
-            sorted(weight_function.keys(), key= lambda simplex: (weight_function[simplex], len(simplex), simplex))
+        self.total_filtration = (total_filtration if total_filtration is not None
+                                 else FilterFunctions.compute_total_filtration(weight_function))
+        ordered_simplices = [None] * len(self.total_filtration)
+        for simplex, index in self.total_filtration.items():
+            ordered_simplices[index] = simplex
+        # integer ranks of the order putting the sub-complex first, so that comparing keys is a plain int comparison
+        self.total_filtration_sub_first = {simplex : index for index, simplex in enumerate(
+            [simplex for simplex in ordered_simplices if simplex in sub_complex] +
+            [simplex for simplex in ordered_simplices if simplex not in sub_complex]
         )}
 
+    @staticmethod
+    def compute_total_filtration(weight_function : dict) -> dict:
+        """Return {simplex : rank} for the total order of simplices by weight, then dimension, then lexicographically.
+        Computed with np.lexsort over the weights, dimensions and vertex columns if the vertices are integers."""
+        simplices = list(weight_function)
+        lengths = np.fromiter((len(simplex) for simplex in simplices), dtype=int, count=len(simplices))
+        max_length = lengths.max(initial=0)
+        vertices = np.full((len(simplices), max_length), -1, dtype=np.int64)  # padding never compared, lengths differ
+        for length in np.unique(lengths):
+            indices = np.flatnonzero(lengths == length)
+            vertices_of_length = np.array([simplices[i] for i in indices]).reshape(len(indices), length)
+            if vertices_of_length.dtype.kind not in 'iu':  # vertices are not integers, order them by Python
+                return {simplex : index for index, simplex in enumerate(
+                    sorted(simplices, key= lambda s: (weight_function[s], len(s), s)))}
+            vertices[indices, :length] = vertices_of_length
+        weights = np.fromiter((weight_function[simplex] for simplex in simplices), dtype=float, count=len(simplices))
+
+        order = np.lexsort((*vertices.transpose()[::-1], lengths, weights))  # last key is the primary one
+        return {simplices[i] : index for index, i in enumerate(order.tolist())}
+
     def filter_function_rad(self):
         """Filter by radius."""
-        return lambda simplex: self.total_filtration[simplex]
+        return self.total_filtration.__getitem__  # unlike a lambda, can be pickled to be sent to other processes
 
     def filter_function_rad_sub_first(self):
         """Filter by radius, but put all sub-complex simplices first, and then the rest."""
-        return lambda simplex: (simplex not in self.sub_complex, self.total_filtration[simplex])
+        return self.total_filtration_sub_first.__getitem__
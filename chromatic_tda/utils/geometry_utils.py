@@ -111,3 +111,41 @@ class GeometryUtils:
 
         TimingUtils().stop("Geom :: Circumsphere Of Weighted Points")
         return z, rad2
+
+    @staticmethod
+    def circumcenters_of_weighted_points(points: npt.NDArray, weights: npt.NDArray) -> npt.NDArray:
+        """Vectorized `circumsphere_of_weighted_points`: given m sets of k weighted points as arrays of shape (m, k, d)
+        and (m, k), return the centers (shape (m, d)) of their circumspheres. The centers of degenerate sets are NaN."""
+        TimingUtils().start("Geom :: Circumcenters Of Weighted Points")
+        if not (len(points.shape) == 3 and weights.shape == points.shape[:2]):
+            raise ValueError("Shape mismatch: points need to be a 3D array, and weights a 2D array of matching shape")
+        if points.shape[1] == 1:
+            centers = points[:, 0].copy()
+        else:
+            a_mats = points[:, 1:] - points[:, :1]  # difference vectors in rows
+            b_vecs = (np.square(a_mats).sum(axis=2) + weights[:, 1:] - weights[:, :1]) / 2
+            x = LinAlgUtils.solve_stacked(a_mats @ a_mats.transpose(0, 2, 1), b_vecs)
+            centers = points[:, 0] + np.einsum('mi,mid->md', x, a_mats)
+        TimingUtils().stop("Geom :: Circumcenters Of Weighted Points")
+        return centers
+
+    @staticmethod
+    def circumspheres_of_simplices(simplices_points: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
+        """Given an array of shape (m, d + 1, d) of vertices of m full-dimensional simplices in R^d, return the
+        centers (shape (m, d)) and squared radii (shape (m,)) of their circumspheres. Degenerate simplices get
+        their (least squares) center with infinite radius."""
+        TimingUtils().start("Geom :: Circumspheres Of Simplices")
+        if not (len(simplices_points.shape) == 3 and simplices_points.shape[1] == simplices_points.shape[2] + 1):
+            raise ValueError("Shape mismatch: simplices need to be given as an array of shape (m, d + 1, d)")
+        a_mats = 2 * (simplices_points[:, 1:] - simplices_points[:, :1])  # rows 2(p_i - p_0)
+        b_vecs = np.square(simplices_points[:, 1:]).sum(axis=2) - np.square(simplices_points[:, :1]).sum(axis=2)
+        try:
+            centers = np.linalg.solve(a_mats, b_vecs[..., np.newaxis])[..., 0]
+            degenerate = np.zeros(len(centers), dtype=bool)
+        except np.linalg.LinAlgError:
+            centers = (np.linalg.pinv(a_mats) @ b_vecs[..., np.newaxis])[..., 0]
+            degenerate = ~np.isclose(np.einsum('mij,mj->mi', a_mats, centers), b_vecs).all(axis=1)
+        rad2 = np.square(simplices_points[:, 0] - centers).sum(axis=1)
+        rad2[degenerate] = np.inf
+        TimingUtils().stop("Geom :: Circumspheres Of Simplices")
+        return centers, rad2
@@ -1,6 +1,6 @@
 import numpy as np
 import numpy.typing as npt
-from numpy.linalg._linalg import SVDResult
+import scipy.linalg
 
 from chromatic_tda.utils.floating_point_utils import FloatingPointUtils
 from chromatic_tda.utils.timing import TimingUtils
@@ -10,9 +10,11 @@ class LinAlgUtils:
     @staticmethod
     def solve(a_matrix: npt.NDArray, b_vector: npt.NDArray, check_solution=False) -> tuple[npt.NDArray, npt.NDArray]:
         """
-        Solve a general linear equation Ax=b using singular value decomposition.
-        Particular solution computed via pseudo-inverse A^+ as A^+ @ b. This makes sense even if the equation
-        has no solution, and returns the least squares solution. By default, no warning is given -- see check_solution.
+        Solve a general linear equation Ax=b using QR decomposition of A^T. If A has full row rank, A^T = Q R gives
+        A = R_1^T Q_1^T, and x = Q_1 y for the solution y of the triangular equation R_1^T y = b. Otherwise, see
+        `solve_rank_deficient`. Particular solution x is the least squares solution of minimal norm, i.e., the same
+        as A^+ @ b for the pseudo-inverse A^+, which is not formed. This makes sense even if the equation has no
+        solution. By default, no warning is given -- see check_solution.
 
         :param a_matrix:        matrix A
         :param b_vector:        right side b
@@ -23,12 +25,16 @@ class LinAlgUtils:
         (vectors in rows).
         """
         TimingUtils().start("LinAlg :: Solve Linear Equation With Kernel")
-        svd : SVDResult = np.linalg.svd(a_matrix)  # svd.U @ diagonal from svd.S @ svd.Vh == A
-        rank : int = LinAlgUtils.count_nonzero(svd.S)
-
-        pseudoinverse = LinAlgUtils.pseudoinverse_from_svd(svd)
-        x = pseudoinverse @ b_vector
-        kernel = svd.Vh[rank :]  # the vectors that Vh sends to E_{rank+1}, ..., E_{n}: Vhh @ E_i is i-th row of Vh
+        m, n = a_matrix.shape
+        full_row_rank = False
+        if m <= n:
+            q_mat, r_mat = np.linalg.qr(a_matrix.transpose(), mode='complete')
+            full_row_rank = bool((np.abs(r_mat.diagonal()) > 1e-12).all())  # as not FloatingPointUtils.is_close
+        if full_row_rank:
+            x = q_mat[:, :m] @ np.linalg.solve(r_mat[:m].transpose(), b_vector)
+            kernel = q_mat[:, m:].transpose()
+        else:
+            x, kernel = LinAlgUtils.solve_rank_deficient(a_matrix, b_vector)
 
         if check_solution and not LinAlgUtils.check_solution(a_matrix, b_vector, x):
             raise np.linalg.LinAlgError("There is no exact solution to given Ax=b.")
@@ -36,6 +42,69 @@ class LinAlgUtils:
         TimingUtils().stop("LinAlg :: Solve Linear Equation With Kernel")
         return x, kernel
 
+    @staticmethod
+    def solve_rank_deficient(a_matrix: npt.NDArray, b_vector: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
+        """The general case of `solve`, using QR decomposition with column pivoting of A^T (non-increasing |R_ii|).
+        The first `rank` columns of Q are an orthonormal basis of the row space of A, and the rest of the kernel."""
+        TimingUtils().start("LinAlg :: Solve Rank Deficient Linear Equation")
+        q_mat, r_mat, _ = scipy.linalg.qr(a_matrix.transpose(), pivoting=True)  # A^T P = Q R
+        rank: int = LinAlgUtils.count_nonzero(r_mat.diagonal())
+
+        row_space = q_mat[:, :rank]
+        kernel = q_mat[:, rank:].transpose()
+        x = np.zeros(a_matrix.shape[1])
+        if rank > 0:  # x = Q_1 y for the least squares solution y of (A Q_1) y = b, where A Q_1 has full column rank
+            q_mat_2, r_mat_2 = np.linalg.qr(a_matrix @ row_space)
+            x = row_space @ scipy.linalg.solve_triangular(r_mat_2, q_mat_2.transpose() @ b_vector)
+        TimingUtils().stop("LinAlg :: Solve Rank Deficient Linear Equation")
+        return x, kernel
+
+    @staticmethod
+    def solve_batch(a_matrices: npt.NDArray, b_vectors: npt.NDArray) -> tuple[npt.NDArray, list[npt.NDArray]]:
+        """Batched `solve` of the linear equations A_i x_i = b_i given as arrays of shape (n, m, k) and (n, m).
+        The equations with A_i of full rank min(m, k) are solved together by QR decompositions of the whole stack,
+        the others one by one by `solve`.
+
+        :return: A tuple (x, kernels) where x is an array of shape (n, k) of particular solutions and kernels is a
+        list of orthonormal bases of Ker(A_i) (vectors in rows)."""
+        TimingUtils().start("LinAlg :: Solve Batch Of Linear Equations With Kernel")
+        n, m, k = a_matrices.shape
+        x = np.zeros((n, k))
+        if m <= k:  # A^T = Q R, so A = R_1^T Q_1^T and x = Q_1 y for R_1^T y = b
+            q_mats, r_mats = np.linalg.qr(a_matrices.transpose(0, 2, 1), mode='complete')
+            r_mats = r_mats[:, :m]
+            kernels = q_mats[:, :, m:].transpose(0, 2, 1)
+        else:  # A = Q R, so x = R^-1 Q^T b
+            q_mats, r_mats = np.linalg.qr(a_matrices)
+            kernels = np.zeros((n, 0, k))
+        full_rank = (np.abs(np.diagonal(r_mats, axis1=1, axis2=2)) > 1e-12).all(axis=1)
+        if m <= k:
+            y = np.linalg.solve(r_mats[full_rank].transpose(0, 2, 1), b_vectors[full_rank][..., np.newaxis])
+            x[full_rank] = (q_mats[full_rank, :, :m] @ y)[..., 0]
+        else:
+            x[full_rank] = np.linalg.solve(
+                r_mats[full_rank], q_mats[full_rank].transpose(0, 2, 1) @ b_vectors[full_rank][..., np.newaxis])[..., 0]
+
+        kernel_list = list(kernels)
+        for i in np.flatnonzero(~full_rank):
+            x[i], kernel_list[i] = LinAlgUtils.solve(a_matrices[i], b_vectors[i])
+        TimingUtils().stop("LinAlg :: Solve Batch Of Linear Equations With Kernel")
+        return x, kernel_list
+
+    @staticmethod
+    def solve_stacked(a_matrices: npt.NDArray, b_vectors: npt.NDArray) -> npt.NDArray:
+        """Solve the square linear equations A_i x_i = b_i given as arrays of shape (n, m, m) and (n, m).
+        Return the solutions as an array of shape (n, m); the rows of (numerically) singular equations are NaN."""
+        TimingUtils().start("LinAlg :: Solve Stacked Linear Equations")
+        try:
+            x = np.linalg.solve(a_matrices, b_vectors[..., np.newaxis])[..., 0]
+        except np.linalg.LinAlgError:
+            regular = np.linalg.cond(a_matrices) < 1 / np.finfo(float).eps
+            x = np.full(b_vectors.shape, np.nan)
+            x[regular] = np.linalg.solve(a_matrices[regular], b_vectors[regular][..., np.newaxis])[..., 0]
+        TimingUtils().stop("LinAlg :: Solve Stacked Linear Equations")
+        return x
+
     @staticmethod
     def orthogonalize_rows(array: npt.NDArray) -> npt.NDArray:
         """Given m x n array A with m <= n,
@@ -46,27 +115,14 @@ class LinAlgUtils:
         if m > n:
             raise ValueError("Only m x n arrays with m <= n allowed")
         qr = np.linalg.qr(array.transpose(), mode='reduced')
-        non_zero_r_diagonal = ~np.array([FloatingPointUtils.is_close(x, 0) for x in qr.R.diagonal()], dtype=bool)
+        non_zero_r_diagonal = np.abs(qr.R.diagonal()) > 1e-12  # as not FloatingPointUtils.is_close(x, 0)
         TimingUtils().stop("LinAlg :: Orthogonalize Rows")
         return qr.Q.transpose()[non_zero_r_diagonal]
 
     @staticmethod
     def count_nonzero(array: npt.NDArray) -> int:
-        return int(np.prod(array.shape)) - sum(int(FloatingPointUtils.is_close(0, x)) for x in array)
+        return int((np.abs(array) > 1e-12).sum())  # as not FloatingPointUtils.is_close(0, x)
 
     @staticmethod
     def check_solution(a_matrix: npt.NDArray, b_vector: npt.NDArray, x_vector: npt.NDArray):
         return FloatingPointUtils.is_all_close(a_matrix @ x_vector, b_vector)
-
-    @staticmethod
-    def pseudoinverse_from_svd(svd: SVDResult) -> npt.NDArray:
-        TimingUtils().start("LinAlg :: Pseudoinverse From SVD")
-        pseudo_s = np.zeros(shape=(svd.U.shape[1], svd.Vh.shape[0]))
-        np.fill_diagonal(pseudo_s, LinAlgUtils.pseudoinverse_of_diagonal(svd.S))
-        pseudoinverse = (svd.U @ pseudo_s @ svd.Vh).transpose()
-        TimingUtils().stop("LinAlg :: Pseudoinverse From SVD")
-        return pseudoinverse
-
-    @staticmethod
-    def pseudoinverse_of_diagonal(diagonal: npt.NDArray) -> npt.NDArray:
-        return np.array([s ** -1 if not FloatingPointUtils.is_close(s, 0) else 0 for s in diagonal])
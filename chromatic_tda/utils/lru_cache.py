@@ -0,0 +1,44 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from chromatic_tda.utils.metrics import Metrics
+
+
+class LRUCache:
+    """Dictionary with at most `max_size` items; adding an item to a full cache drops the least recently used one.
+    The hits and misses of `get` are added to `metrics` as '`topic` :: Hits' and '`topic` :: Misses'."""
+    max_size: int
+    topic: str
+    metrics: Metrics
+    items: OrderedDict
+
+    def __init__(self, max_size: int, topic: str, metrics: Metrics) -> None:
+        if max_size < 1:
+            raise ValueError("The size of the cache needs to be positive.")
+        self.max_size = max_size
+        self.topic = topic
+        self.metrics = metrics
+        self.items = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.items
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self.items:
+            self.metrics.add(f"{self.topic} :: Misses")
+            return default
+        self.metrics.add(f"{self.topic} :: Hits")
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if len(self.items) > self.max_size:
+            self.items.popitem(last=False)
+
+    def clear(self) -> None:
+        self.items.clear()
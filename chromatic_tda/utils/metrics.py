@@ -0,0 +1,32 @@
+class Metrics:
+    """Counts and sizes describing a run of the algorithms on one complex, e.g. the simplices of each dimension, the
+    radii taken from the cofaces or the column additions of the reductions, as {name : value}.
+
+    The metrics are only recorded while `Metrics.enabled` is True (see `enable`); otherwise recording costs a single
+    check. The switch is shared by all complexes."""
+    enabled: bool = False
+    values: dict[str, int]
+
+    def __init__(self) -> None:
+        self.values = {}
+
+    @staticmethod
+    def enable() -> None:
+        Metrics.enabled = True
+
+    @staticmethod
+    def disable() -> None:
+        Metrics.enabled = False
+
+    def add(self, name: str, number: int = 1) -> None:
+        """Add `number` to the count `name`."""
+        if Metrics.enabled:
+            self.values[name] = self.values.get(name, 0) + number
+
+    def record(self, name: str, value: int) -> None:
+        """Set the size `name` to `value`, e.g. the current number of simplices."""
+        if Metrics.enabled:
+            self.values[name] = value
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(self.values)
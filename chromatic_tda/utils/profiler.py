@@ -0,0 +1,264 @@
+import functools
+import json
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Iterator, Optional
+
+from chromatic_tda.utils.singleton import singleton
+
+
+class StageNode:
+    """A stage of the profile: its total time and number of calls, and the stages started inside it by name.
+    If memory is profiled, also the peak of the traced memory during a call above its start (maximum over the calls)
+    and the memory retained after the calls (sum over the calls), in bytes."""
+    __slots__ = ('name', 'total_time', 'calls', 'peak_memory', 'retained_memory', 'children')
+    name: str
+    total_time: float
+    calls: int
+    peak_memory: int
+    retained_memory: int
+    children: dict[str, 'StageNode']
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.total_time = 0.
+        self.calls = 0
+        self.peak_memory = 0
+        self.retained_memory = 0
+        self.children = {}
+
+    def child(self, name: str) -> 'StageNode':
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = StageNode(name)
+        return node
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'total_time': self.total_time, 'calls': self.calls,
+                'peak_memory': self.peak_memory, 'retained_memory': self.retained_memory,
+                'children': [child.to_dict() for child in self.children.values()]}
+
+    def merge_dict(self, stage: dict) -> None:
+        """Add the times and calls of the stage given by `to_dict` (and of its sub-stages) to this node."""
+        self.total_time += stage['total_time']
+        self.calls += stage['calls']
+        self.peak_memory = max(self.peak_memory, stage['peak_memory'])
+        self.retained_memory += stage['retained_memory']
+        for child in stage['children']:
+            self.child(child['name']).merge_dict(child)
+
+
+@singleton
+class Profiler:
+    """Hierarchical profiler of the pipeline stages.
+
+    A stage is measured between `start(name)` and `stop(name)`, by the context manager `stage(name)` or by the decorator
+    `profiled(name)`. The stages started inside another stage are its sub-stages, so the stages form a tree, summed
+    over the calls with the same path. When disabled (the default), `start` and `stop` return right away.
+
+    Each thread has its own stack of open stages, and the trees of the threads are merged in the output. A worker
+    process returns its profile by `snapshot`, which the parent adds to its current stage by `merge_snapshot`.
+    If tracing is enabled, every call of a stage is also recorded as an event for `export_chrome_trace`.
+
+    If memory profiling is enabled, the memory allocated by Python and numpy is traced by `tracemalloc` (which slows
+    down the computation considerably), and each stage records the peak and the retained traced memory. The traced
+    memory is shared by the threads, so the memory of stages running concurrently in threads is mixed."""
+    enabled: bool
+    trace: bool
+    memory: bool
+    counters: dict[str, int]
+    events: list[tuple[str, float, float, int, int]]  # (name, start, duration, process id, thread id)
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.trace = False
+        self.memory = False
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self, trace: bool = False, memory: bool = False) -> None:
+        self.enabled = True
+        self.trace = trace
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.trace = False
+        self.memory = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self) -> None:
+        """Drop all the measured stages, counts and events."""
+        self._local = threading.local()
+        self._roots: list[StageNode] = []
+        self.counters = {}
+        self.events = []
+        self._origin = perf_counter()
+
+    def _stack(self) -> list[tuple[StageNode, float, Optional[list[int]]]]:
+        """Return the stack of the open stages of this thread, as (node, start time, memory), where memory is
+        [traced memory at the start, peak of the traced memory so far] if memory is profiled, and None otherwise."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            root = StageNode('')
+            with self._lock:
+                self._roots.append(root)
+            stack = self._local.stack = [(root, 0., None)]
+        return stack
+
+    def start(self, name: str) -> None:
+        if not self.enabled:
+            return
+        stack = self._stack()
+        memory = None
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if stack[-1][2] is not None:
+                stack[-1][2][1] = max(stack[-1][2][1], peak)
+            tracemalloc.reset_peak()  # the peak since the start of this stage, the enclosing one keeps its own
+            memory = [current, current]
+        stack.append((stack[-1][0].child(name), perf_counter(), memory))
+
+    def stop(self, name: str) -> None:
+        """Stop the innermost open stage `name`. The stages opened inside it and not stopped yet are stopped too.
+        A stage that is not open is ignored."""
+        if not self.enabled:
+            return
+        stopped_at = perf_counter()
+        stack = self._stack()
+        if not any(node.name == name for node, *_ in stack[1:]):
+            return
+        while True:
+            node, started_at, memory = stack.pop()
+            node.total_time += stopped_at - started_at
+            node.calls += 1
+            if memory is not None and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, memory[1])
+                node.peak_memory = max(node.peak_memory, peak - memory[0])
+                node.retained_memory += current - memory[0]
+                if stack[-1][2] is not None:
+                    stack[-1][2][1] = max(stack[-1][2][1], peak)
+            if self.trace:
+                self.events.append((node.name, started_at - self._origin, stopped_at - started_at,
+                                    os.getpid(), threading.get_ident()))
+            if node.name == name:
+                return
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def profiled(self, name: Optional[str] = None) -> Callable:
+        """Decorator measuring each call of the function as the stage `name` (default: the qualified function name)."""
+        def decorator(function: Callable) -> Callable:
+            stage_name = function.__qualname__ if name is None else name
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                self.start(stage_name)
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.stop(stage_name)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, number: int = 1) -> None:
+        """Count `number` events of `name`, e.g. skipped items, without measuring time."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + number
+
+    def stage_tree(self) -> dict:
+        """Return the tree of the stages (measured so far) of all threads, as nested dicts with the keys 'name',
+        'total_time', 'calls', 'peak_memory', 'retained_memory' and 'children'. The root has an empty name."""
+        tree = StageNode('')
+        with self._lock:
+            roots = list(self._roots)
+        for root in roots:
+            tree.merge_dict(root.to_dict())
+        return tree.to_dict()
+
+    def flat_totals(self) -> dict[str, tuple[float, int]]:
+        """Return {stage name : (total time, calls)} summed over all the paths of the stage. The time of a stage
+        inside a stage of the same name is already counted in the outer one."""
+        totals: dict[str, tuple[float, int]] = {}
+
+        def add(stage: dict, open_names: frozenset) -> None:
+            time, calls = totals.get(stage['name'], (0., 0))
+            totals[stage['name']] = (time + (0. if stage['name'] in open_names else stage['total_time']),
+                                     calls + stage['calls'])
+            for child in stage['children']:
+                add(child, open_names | {stage['name']})
+
+        for stage in self.stage_tree()['children']:
+            add(stage, frozenset())
+        return totals
+
+    def snapshot(self) -> dict:
+        """Return the profile of this process (stages of all threads, counts and events) as plain data, e.g. to be
+        returned from a worker process and merged by `merge_snapshot`."""
+        return {'stages': self.stage_tree(), 'counters': dict(self.counters), 'events': list(self.events),
+                'origin': self._origin}
+
+    def merge_snapshot(self, snapshot: dict) -> None:
+        """Add the profile of a snapshot (e.g. of a worker process) to the currently open stage of this thread."""
+        if not self.enabled:
+            return
+        self._stack()[-1][0].merge_dict({**snapshot['stages'], 'total_time': 0., 'calls': 0, 'peak_memory': 0,
+                                         'retained_memory': 0})
+        for name, number in snapshot['counters'].items():
+            self.count(name, number)
+        if self.trace:
+            # the clocks of the processes share the origin (perf_counter is system-wide on the usual platforms)
+            shift = snapshot['origin'] - self._origin
+            self.events.extend((name, start + shift, duration, pid, tid)
+                               for name, start, duration, pid, tid in snapshot['events'])
+
+    def to_json(self) -> str:
+        return json.dumps({'stages': self.stage_tree(), 'counters': self.counters})
+
+    def export_json(self, path) -> None:
+        """Write the tree of the stages and the counts to a JSON file."""
+        with open(path, 'w') as file:
+            file.write(self.to_json())
+
+    def export_chrome_trace(self, path) -> None:
+        """Write the traced events to a JSON file in the Chrome trace event format (for chrome://tracing or
+        Perfetto). Tracing has to be enabled by `enable(trace=True)`."""
+        trace_events = [{'name': name, 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6, 'pid': pid, 'tid': tid}
+                        for name, start, duration, pid, tid in self.events]
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, file)
+
+    def print(self) -> None:
+        """Print the tree of the stages, indented by depth, and the counts. If memory is profiled, the peak and the
+        retained memory of each stage are printed after its time."""
+        def print_stage(stage: dict, depth: int) -> None:
+            label = '  ' * depth + stage['name']
+            memory = (f", peak = {stage['peak_memory'] / 2 ** 20:9.2f} MiB, "
+                      f"retained = {stage['retained_memory'] / 2 ** 20:9.2f} MiB" if self.memory else "")
+            print(f"Time[{label:<58}] = {stage['total_time']:6.2f} s (# calls : {stage['calls']:<6}, "
+                  f"average = {stage['total_time'] / max(stage['calls'], 1):7.4f}{memory})")
+            for child in stage['children']:
+                print_stage(child, depth + 1)
+
+        for stage in self.stage_tree()['children']:
+            print_stage(stage, 0)
+        for name in sorted(self.counters):
+            print(f"Count[{name:<57}] = {self.counters[name]}")
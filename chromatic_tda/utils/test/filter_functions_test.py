@@ -0,0 +1,35 @@
+import unittest
+import numpy as np
+
+from chromatic_tda.entities.simplicial_complex import SimplicialComplex
+from chromatic_tda.utils.filter_functions import FilterFunctions
+
+
+class FilterFunctionsTest(unittest.TestCase):
+
+    def test_total_filtration_matches_sorting_with_ties(self):
+        rng = np.random.default_rng(0)
+        cplx = SimplicialComplex([tuple(rng.choice(30, 4, replace=False)) for _ in range(40)])
+        cplx.set_simplex_weights({s: float(rng.integers(1, 4)) for s in cplx.simplices()})
+        weights = cplx.weight_function()
+
+        total_filtration = FilterFunctions.compute_total_filtration(weights)
+        expected = sorted(weights, key=lambda s: (weights[s], len(s), s))
+        assert [s for s, _ in sorted(total_filtration.items(), key=lambda item: item[1])] == expected
+
+    def test_total_filtration_non_integer_vertices(self):
+        weights = {('a',): 0, ('b',): 0, ('a', 'b'): 1}
+        assert FilterFunctions.compute_total_filtration(weights) == {('a',): 0, ('b',): 1, ('a', 'b'): 2}
+
+    def test_total_filtration_cache_reset_by_weights(self):
+        cplx = SimplicialComplex([(0, 1), (1, 2)])
+        cplx.set_simplex_weights({(0, 1): 2, (1, 2): 1})
+        assert cplx.core_complex.get_total_filtration()[(1, 2)] == 3
+        cplx.set_simplex_weights({(0, 1): 1, (1, 2): 2})
+        assert cplx.core_complex.get_total_filtration()[(1, 2)] == 4
+
+    def test_sub_first_ranks(self):
+        weights = {(0,): 0, (1,): 0, (2,): 0, (0, 1): 1, (1, 2): 2}
+        filters = FilterFunctions(weights, sub_complex={(1,), (2,), (1, 2)})
+        key = filters.filter_function_rad_sub_first()
+        assert sorted(weights, key=key) == [(1,), (2,), (1, 2), (0,), (0, 1)]
@@ -122,3 +122,16 @@ class LinearAlgebraTest(unittest.TestCase):
         assert ortho.shape == (4, 9)
         assert rank_ortho == 4 and rank_ortho_a_mat == 4  # row spaces match
         assert np.isclose(ortho @ ortho.transpose(), np.identity(4)).all()  # rows are orthonormal
+
+    def test_solve_batch_same_as_solve(self):
+        rng = np.random.default_rng(0)
+        for m, k in [(4, 9), (9, 4), (5, 5)]:
+            a_mats = rng.random((20, m, k))
+            a_mats[3] = np.concatenate([a_mats[3][:2], a_mats[3][:1] + a_mats[3][1:2], a_mats[3][3:]])  # singular
+            b_vecs = rng.random((20, m))
+            x, kernels = LinAlgUtils.solve_batch(a_mats, b_vecs)
+            for a_mat, b_vec, x_batch, ker_batch in zip(a_mats, b_vecs, x, kernels):
+                x_single, ker_single = LinAlgUtils.solve(a_mat, b_vec)
+                assert np.isclose(x_batch, x_single).all()
+                assert ker_batch.shape == ker_single.shape
+                assert np.isclose(a_mat @ ker_batch.transpose(), 0).all()
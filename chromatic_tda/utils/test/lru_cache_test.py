@@ -0,0 +1,33 @@
+import unittest
+
+from chromatic_tda.utils.lru_cache import LRUCache
+from chromatic_tda.utils.metrics import Metrics
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_least_recently_used_dropped(self):
+        cache = LRUCache(2, topic="Test Cache", metrics=Metrics())
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1  # 'b' is now the least recently used
+        cache.put('c', 3)
+        assert len(cache) == 2
+        assert 'b' not in cache
+        assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+
+    def test_hits_and_misses_counted(self):
+        metrics = Metrics()
+        cache = LRUCache(4, topic="Test Cache", metrics=metrics)
+        cache.put('a', 1)
+        Metrics.enable()
+        try:
+            cache.get('a')
+            cache.get('a')
+            cache.get('b')
+        finally:
+            Metrics.disable()
+        assert metrics.as_dict() == {"Test Cache :: Hits": 2, "Test Cache :: Misses": 1}
+
+    def test_size_positive(self):
+        with self.assertRaises(ValueError):
+            LRUCache(0, topic="Test Cache", metrics=Metrics())
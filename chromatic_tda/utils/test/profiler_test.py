@@ -0,0 +1,78 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from chromatic_tda.utils.profiler import Profiler
+from chromatic_tda.utils.timing import TimingUtils
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        Profiler().reset()
+        Profiler().enable(trace=True)
+
+    def tearDown(self):
+        Profiler().disable()
+        Profiler().reset()
+
+    def test_nested_stages(self):
+        @Profiler().profiled("Inner")
+        def inner():
+            pass
+
+        for _ in range(2):
+            with Profiler().stage("Outer"):
+                inner()
+                inner()
+        Profiler().start("Other")
+        Profiler().start("Unstopped")
+        Profiler().stop("Other")  # stops also the stage opened inside
+
+        outer, other = Profiler().stage_tree()['children']
+        assert (outer['name'], outer['calls']) == ("Outer", 2)
+        assert [(child['name'], child['calls']) for child in outer['children']] == [("Inner", 4)]
+        assert outer['total_time'] >= outer['children'][0]['total_time']
+        assert [(child['name'], child['calls']) for child in other['children']] == [("Unstopped", 1)]
+        assert TimingUtils().call_count_dict == {"Outer": 2, "Inner": 4, "Other": 1, "Unstopped": 1}
+
+    def test_disabled_records_nothing(self):
+        Profiler().disable()
+        with Profiler().stage("Stage"):
+            Profiler().count("Event")
+        assert Profiler().stage_tree()['children'] == [] and Profiler().counters == {}
+
+    def test_merge_snapshot_and_export(self):
+        with Profiler().stage("Worker"):
+            Profiler().count("Event", 3)
+        snapshot = json.loads(json.dumps(Profiler().snapshot()))  # as returned from a worker process
+        Profiler().reset()
+        with Profiler().stage("Parent"):
+            Profiler().merge_snapshot(snapshot)
+
+        parent, = Profiler().stage_tree()['children']
+        assert [(child['name'], child['calls']) for child in parent['children']] == [("Worker", 1)]
+        assert Profiler().counters == {"Event": 3}
+        with tempfile.TemporaryDirectory() as folder:
+            Profiler().export_chrome_trace(Path(folder) / 'trace.json')
+            with open(Path(folder) / 'trace.json') as file:
+                events = json.load(file)['traceEvents']
+        assert sorted(event['name'] for event in events) == ["Parent", "Worker"]
+        assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+
+    def test_peak_and_retained_memory(self):
+        Profiler().enable(memory=True)
+        with Profiler().stage("Outer"):
+            with Profiler().stage("Freed"):
+                array = np.ones(2 * 10 ** 6)  # 16 MB
+                del array
+            with Profiler().stage("Kept"):
+                array = np.ones(10 ** 6)
+
+        outer, = Profiler().stage_tree()['children']
+        freed, kept = outer['children']
+        assert freed['peak_memory'] >= 16 * 10 ** 6 and freed['retained_memory'] < 10 ** 6
+        assert kept['peak_memory'] >= 8 * 10 ** 6 and kept['retained_memory'] >= 8 * 10 ** 6
+        assert outer['peak_memory'] >= 16 * 10 ** 6 > outer['retained_memory'] >= 8 * 10 ** 6  # the peak of Freed
@@ -1,41 +1,51 @@
-from time import perf_counter
-
+from chromatic_tda.utils.profiler import Profiler
 from chromatic_tda.utils.singleton import singleton
 
 
 @singleton
 class TimingUtils:
-    total_time_dict : dict[str, float]
-    started_at_dict : dict[str, float]
-    call_count_dict : dict[str, int]
-    log_times : bool
+    """Flat interface of the `Profiler`: the times, calls and counts are summed over all the paths of each topic."""
+    profiler: Profiler
 
     def __init__(self, log_times=False):
-        self.log_times = log_times
-        self.flush()
+        self.profiler = Profiler()
+        if log_times:
+            self.profiler.enable()
+
+    @property
+    def log_times(self) -> bool:
+        return self.profiler.enabled
+
+    @log_times.setter
+    def log_times(self, log_times: bool) -> None:
+        if log_times:
+            self.profiler.enable(trace=self.profiler.trace)
+        else:
+            self.profiler.disable()
 
     def flush(self):
-        self.total_time_dict = {}
-        self.started_at_dict = {}
-        self.call_count_dict = {}
+        self.profiler.reset()
 
     def start(self, topic: str):
-        self.started_at_dict[topic] = perf_counter()
-        if self.log_times:
-            if topic in self.call_count_dict:
-                self.call_count_dict[topic] += 1
-            else:
-                self.call_count_dict[topic] = 1
+        self.profiler.start(topic)
 
     def stop(self, topic: str):
-        if self.log_times:
-            if topic in self.total_time_dict:
-                self.total_time_dict[topic] += perf_counter() - self.started_at_dict[topic]
-            else:
-                self.total_time_dict[topic] = perf_counter() - self.started_at_dict[topic]
+        self.profiler.stop(topic)
+
+    @property
+    def total_time_dict(self) -> dict[str, float]:
+        return {topic: time for topic, (time, _) in self.profiler.flat_totals().items()}
+
+    @property
+    def call_count_dict(self) -> dict[str, int]:
+        return {topic: calls for topic, (_, calls) in self.profiler.flat_totals().items()}
 
     def print(self):
-        for topic in sorted(self.total_time_dict):
-            print(f"Time[{topic:<58}] = {self.total_time_dict[topic]:6.2f} s "
-                  f"(# calls : {self.call_count_dict[topic]:<6}, "
-                  f"average = {self.total_time_dict[topic]/self.call_count_dict[topic]:7.4f})")
+        totals = self.profiler.flat_totals()
+        for topic in sorted(totals):
+            total_time, calls = totals[topic]
+            print(f"Time[{topic:<58}] = {total_time:6.2f} s "
+                  f"(# calls : {calls:<6}, "
+                  f"average = {total_time / max(calls, 1):7.4f})")
+        for topic in sorted(self.profiler.counters):
+            print(f"Count[{topic:<57}] = {self.profiler.counters[topic]}")